@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""Environment and models shared by the benchmarks.
+
+The benchmarks run as scripts, so they import this module as ``_common``
+from their own directory.
+
+"""
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.schema import Column as SAColumn
+from sqlalchemy.types import Integer, Unicode
+
+from dodotable.environment import Environment
+
+
+__all__ = 'FIELDS', 'Base', 'BenchmarkEnvironment', 'Music', 'Record'
+
+
+Base = declarative_base()
+
+FIELDS = ['field{}'.format(n) for n in range(8)]
+
+
+class Music(Base):
+
+    id = SAColumn(Integer, primary_key=True)
+
+    name = SAColumn(Unicode, nullable=False)
+
+    artist = SAColumn(Unicode)
+
+    __tablename__ = 'music'
+
+
+class Record(Base):
+
+    id = SAColumn(Integer, primary_key=True)
+
+    status = SAColumn(Unicode, nullable=False)
+
+    locals().update((name, SAColumn(Unicode)) for name in FIELDS)
+
+    __tablename__ = 'record'
+
+
+class BenchmarkEnvironment(Environment):
+
+    def build_url(self, **kwargs):
+        return '/?' + '&'.join('{}={}'.format(*kv)
+                               for kv in sorted(kwargs.items()))
+
+    def get_session(self):
+        return None
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""Measure memory and time to build a page of 10,000
+:class:`dodotable.schema.Cell` s.
+
+.. code-block:: console
+
+   $ PYTHONPATH=. python benchmarks/cell_memory.py
+
+"""
+import timeit
+import tracemalloc
+
+from dodotable.schema import Cell, Row
+
+
+ROWS = 1000
+
+COLUMNS = 10
+
+
+def build_page():
+    rows = []
+    for i in range(ROWS):
+        row = Row()
+        for j in range(COLUMNS):
+            row.append(Cell(col=j, row=i, data=j))
+        rows.append(row)
+    return rows
+
+
+def main():
+    tracemalloc.start()
+    page = build_page()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del page
+    elapsed = min(timeit.repeat(build_page, number=10, repeat=3)) / 10
+    print('{} cells: {:.1f} KiB, {:.1f} bytes per cell, {:.2f} ms'.format(
+        ROWS * COLUMNS, size / 1024.0, size / float(ROWS * COLUMNS),
+        elapsed * 1000
+    ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""Measure how often and how long :class:`dodotable.schema.Table` evaluates
+its filters while building the count and page queries, and the Python-side
+cost of compiling the page query per request.
+
+Every request searches a different word, so only bound parameter values
+change.  ``compile`` is what :func:`dodotable.cache.statement_key` did for
+every request before it reused compiled statements.
+
+.. code-block:: console
+
+   $ PYTHONPATH=. python benchmarks/filter_compile.py
+
+"""
+import itertools
+import timeit
+
+from _common import FIELDS, Base, BenchmarkEnvironment, Record
+from sqlalchemy.engine import create_engine
+from sqlalchemy.orm import Session
+
+from dodotable.cache import ResultCache, statement_key
+from dodotable.condition import Ilike, IlikeSet, SelectFilter
+from dodotable.schema import Column, Schema, Table
+from dodotable.search import Contains
+
+
+class CountingContains(Contains):
+
+    calls = 0
+
+    def criterion(self, attribute, word):
+        CountingContains.calls += 1
+        return super(CountingContains, self).criterion(attribute, word)
+
+
+def table(session, word=u'word'):
+    request_args = {'search_record.word': word,
+                    'search_record.type': FIELDS[0],
+                    'select.status': u'open'}
+    strategy = CountingContains()
+    table = Table(Record, u'record', columns=[
+        Column(attr='id', label=u'id', order_by='id.desc'),
+    ] + [
+        Column(attr=name, label=name, filters=[
+            Ilike(Record, name, request_args, strategy=strategy),
+        ])
+        for name in FIELDS
+    ], sqlalchemy_session=session)
+    table.add_filter(IlikeSet(table, request_args))
+    table.add_filter(SelectFilter(Record, 'status', [
+        {'name': u'open', 'description': u'open'},
+        {'name': u'closed', 'description': u'closed'},
+    ], request_args))
+    return table
+
+
+def main():
+    Schema.environment = BenchmarkEnvironment()
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(bind=engine)
+    session = Session(bind=engine)
+
+    def build():
+        t = table(session)
+        t.query.offset(0).limit(10)
+        t.build_base_query()
+        return t
+
+    number = 2000
+    elapsed = min(timeit.repeat(build, number=number, repeat=5)) / number
+    CountingContains.calls = 0
+    t = build()
+    print('criterion() calls per request: {}'.format(CountingContains.calls))
+    print('criteria compile time: {:.1f} us'.format(
+        t.criteria.elapsed * 1e6
+    ))
+    print('build count + page queries: {:.1f} us'.format(elapsed * 1e6))
+
+    words = itertools.cycle(u'word{}'.format(n) for n in range(1000))
+    offsets = itertools.cycle(range(0, 1000, 10))
+
+    def page():
+        return table(session, next(words)).query \
+                                          .offset(next(offsets)).limit(10)
+
+    def compile():
+        compiled = page().statement.compile(dialect=engine.dialect)
+        return str(compiled), sorted(compiled.params.items())
+
+    def cached():
+        return statement_key(page())
+
+    result_cache = ResultCache()
+
+    def select():
+        t = table(session)
+        t.result_cache = result_cache
+        t.select(0, 10)
+
+    number = 1000
+    for label, function in [
+        ('build page query', page),
+        ('build + compile', compile),
+        ('build + statement_key', cached),
+        ('select (result cache hit)', select),
+    ]:
+        elapsed = min(timeit.repeat(function, number=number,
+                                    repeat=5)) / number
+        print('{:<26} {:7.1f} us'.format(label, elapsed * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""Compare nested and flat rendering of :class:`dodotable.schema.Table`.
+
+.. code-block:: console
+
+   $ PYTHONPATH=. python benchmarks/flat_render.py
+
+"""
+import timeit
+
+from _common import Base, BenchmarkEnvironment, Music
+from sqlalchemy.engine import create_engine
+from sqlalchemy.orm import Session
+
+from dodotable.schema import Column, Schema, Table
+
+
+def main():
+    Schema.environment = BenchmarkEnvironment()
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(bind=engine)
+    session = Session(bind=engine)
+    session.add_all(Music(name=u'music {}'.format(n), artist=u'artist')
+                    for n in range(5000))
+    session.commit()
+    for rows in 50, 500, 5000:
+        results = []
+        for flat in False, True:
+            table = Table(Music, u'music', columns=[
+                Column(attr='id', label=u'id', order_by='id.asc'),
+                Column(attr='name', label=u'name'),
+                Column(attr='artist', label=u'artist'),
+            ], sqlalchemy_session=session, flat=flat).select(0, rows)
+            number = max(1, 5000 // rows)
+            elapsed = min(timeit.repeat(table.__html__, number=number,
+                                        repeat=3)) / number
+            results.append(elapsed)
+        print('{:>5} rows: nested {:8.2f} ms, flat {:8.2f} ms '
+              '({:.1f}x)'.format(rows, results[0] * 1000, results[1] * 1000,
+                                 results[0] / results[1]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""Compare HTML rendering and :meth:`dodotable.schema.Table.to_json`.
+
+.. code-block:: console
+
+   $ PYTHONPATH=. python benchmarks/json_render.py
+
+"""
+import timeit
+
+from _common import Base, BenchmarkEnvironment, Music
+from mock import patch
+from sqlalchemy.engine import create_engine
+from sqlalchemy.orm import Session
+
+from dodotable.schema import Column, Schema, Table
+
+
+def measure(function, rows):
+    number = max(1, 5000 // rows)
+    return min(timeit.repeat(function, number=number, repeat=3)) / number
+
+
+def main():
+    Schema.environment = BenchmarkEnvironment()
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(bind=engine)
+    session = Session(bind=engine)
+    session.add_all(Music(name=u'music {}'.format(n), artist=u'artist')
+                    for n in range(5000))
+    session.commit()
+    for rows in 50, 500, 5000:
+        table = Table(Music, u'music', columns=[
+            Column(attr='id', label=u'id', order_by='id.asc'),
+            Column(attr='name', label=u'name'),
+            Column(attr='artist', label=u'artist'),
+        ], sqlalchemy_session=session, flat=True).select(0, rows)
+        html = measure(table.__html__, rows)
+        fast = measure(table.to_json, rows)
+        with patch('dodotable.util.orjson', None):
+            stdlib = measure(table.to_json, rows)
+        print('{:>5} rows: flat html {:8.2f} ms, json {:8.2f} ms, '
+              'orjson {:8.2f} ms'.format(rows, html * 1000, stdlib * 1000,
+                                         fast * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""Measure :attr:`dodotable.schema.Pager.pages` and rendering of
+:class:`dodotable.schema.Pager`.
+
+.. code-block:: console
+
+   $ PYTHONPATH=. python benchmarks/pager_render.py
+
+"""
+import timeit
+
+from _common import BenchmarkEnvironment
+
+from dodotable.schema import Pager
+
+
+def main():
+    pager = Pager(limit=10, offset=450, count=100000)
+    pager.environment = BenchmarkEnvironment()
+    pager.__html__()
+    for name, statement in [('pages', lambda: pager.pages),
+                            ('__html__', pager.__html__)]:
+        number = 10000 if name == 'pages' else 1000
+        elapsed = min(timeit.repeat(statement, number=number,
+                                    repeat=5)) / number
+        print('Pager.{}: {:.2f} usec'.format(name, elapsed * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""Compare :mod:`dodotable.search` strategies on a local SQLite dataset.
+
+:class:`~dodotable.search.Contains` (``ILIKE '%word%'``) scans the table,
+:class:`~dodotable.search.Prefix` uses a ``COLLATE NOCASE`` index,
+:class:`~dodotable.search.Fts5` uses an FTS5 virtual table and
+:class:`~dodotable.search.SearchIndex` searches in memory.
+
+.. code-block:: console
+
+   $ PYTHONPATH=. python benchmarks/search_strategies.py
+
+"""
+import os
+import random
+import tempfile
+import timeit
+
+from _common import Base, BenchmarkEnvironment, Music
+from sqlalchemy.engine import create_engine
+from sqlalchemy.orm import Session
+
+from dodotable.condition import Ilike, IlikeSet
+from dodotable.schema import Column, Schema, Table
+from dodotable.search import Contains, Fts5, Prefix, SearchIndex
+
+
+ROWS = 200000
+
+SYLLABLES = [u'ka', u'no', u'ri', u'su', u'te', u'mo', u'ha', u'ru', u'zi',
+             u'po', u'la', u'ne', u'vi', u'do', u'xe', u'qu']
+
+
+def word(random):
+    return u''.join(random.choice(SYLLABLES)
+                    for _ in range(random.randint(2, 5)))
+
+
+def populate(engine):
+    Base.metadata.create_all(bind=engine)
+    generator = random.Random(0)
+    with engine.begin() as connection:
+        connection.execute(Music.__table__.insert(), [
+            {'name': u' '.join(word(generator) for _ in range(3))}
+            for _ in range(ROWS)
+        ])
+        connection.execute('CREATE INDEX ix_music_name_nocase '
+                           'ON music (name COLLATE NOCASE)')
+        connection.execute("CREATE VIRTUAL TABLE music_fts USING fts5"
+                           "(name, content='music', content_rowid='id')")
+        connection.execute("INSERT INTO music_fts(music_fts) "
+                           "VALUES('rebuild')")
+
+
+def table(session, strategy, search, index=None):
+    request_args = {'search_music.word': search,
+                    'search_music.type': 'name'}
+    table = Table(Music, u'music', columns=[
+        Column(attr='id', label=u'id', order_by='id.asc'),
+        Column(attr='name', label=u'name', filters=[
+            Ilike(Music, 'name', request_args, strategy=strategy),
+        ]),
+    ], sqlalchemy_session=session)
+    table.add_filter(IlikeSet(table, request_args, index=index))
+    return table
+
+
+def main():
+    Schema.environment = BenchmarkEnvironment()
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'search.db')
+    engine = create_engine('sqlite:///' + path)
+    try:
+        populate(engine)
+        session = Session(bind=engine)
+        search = u'kanori'
+        index = SearchIndex(Music, ['name']).build(session)
+        for label, strategy, index_ in [
+            ('ILIKE %word%', Contains(), None),
+            ('LIKE word%', Prefix(case_sensitive=True), None),
+            ('FTS5', Fts5('music_fts'), None),
+            ('SearchIndex', None, index),
+        ]:
+            query = table(session, strategy, search, index_).query.limit(10)
+            plan = session.execute(
+                'EXPLAIN QUERY PLAN ' + str(query.statement.compile(
+                    dialect=engine.dialect,
+                    compile_kwargs={'literal_binds': True},
+                ))
+            ).fetchall()
+            number = 20
+
+            def select():
+                table(session, strategy, search, index_).select(0, 10)
+            elapsed = min(timeit.repeat(select, number=number,
+                                        repeat=3)) / number
+            print('{:<14} {:8.2f} ms  ({})'.format(
+                label, elapsed * 1000, '; '.join(row[-1] for row in plan)
+            ))
+        session.close()
+    finally:
+        engine.dispose()
+        os.remove(path)
+        os.rmdir(directory)
+
+
+if __name__ == '__main__':
+    main()
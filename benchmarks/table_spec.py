@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""Compare building a :class:`dodotable.schema.Table` per request with
+:meth:`dodotable.spec.TableSpec.bind`.
+
+.. code-block:: console
+
+   $ PYTHONPATH=. python benchmarks/table_spec.py
+
+"""
+import timeit
+
+from _common import FIELDS, Base, BenchmarkEnvironment, Record
+from sqlalchemy.engine import create_engine
+from sqlalchemy.orm import Session
+
+from dodotable.condition import Ilike, IlikeSet, SelectFilter
+from dodotable.helper import Limit
+from dodotable.schema import Column, Schema, Table
+from dodotable.spec import TableSpec
+
+
+CHOICES = [{'name': u'open', 'description': u'open'},
+           {'name': u'closed', 'description': u'closed'}]
+
+
+def columns(request_args, order_by):
+    return [Column(attr='id', label=u'id', order_by=order_by)] + [
+        Column(attr=name, label=name, order_by=order_by, filters=[
+            Ilike(Record, name, request_args),
+        ])
+        for name in FIELDS
+    ]
+
+
+def build_table(session, request_args):
+    table = Table(Record, u'record', sqlalchemy_session=session,
+                  columns=columns(request_args,
+                                  request_args.get('order_by', 'id.desc')))
+    table.add_filter(IlikeSet(table, request_args))
+    table.add_filter(SelectFilter(Record, 'status', CHOICES, request_args))
+    table.add_filter(Limit(table, request_args))
+    return table
+
+
+spec = TableSpec(Record, u'record', columns=columns(None, 'id.desc'))
+spec.add_filter(IlikeSet(spec, None))
+spec.add_filter(SelectFilter(Record, 'status', CHOICES, None))
+spec.add_filter(Limit(spec, None))
+
+
+def main():
+    Schema.environment = BenchmarkEnvironment()
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(bind=engine)
+    session = Session(bind=engine)
+    request_args = {'search_record.word': u'word',
+                    'search_record.type': FIELDS[0],
+                    'select.status': u'open',
+                    'order_by': 'field1.asc'}
+    number = 5000
+    for label, build in [
+        ('Table(...)', lambda: build_table(session, request_args)),
+        ('TableSpec.bind()', lambda: spec.bind(request_args, session)),
+    ]:
+        elapsed = min(timeit.repeat(build, number=number,
+                                    repeat=5)) / number
+
+        def query():
+            build().query.offset(0).limit(10)
+        with_query = min(timeit.repeat(query, number=number // 5,
+                                       repeat=5)) / (number // 5)
+        print('{:<18} construct {:6.1f} us   + page query {:6.1f} us'.format(
+            label, elapsed * 1e6, with_query * 1e6
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+""":mod:`dodotable.aio` --- tables on asyncio
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+:class:`~dodotable.schema.Table` 의 쿼리를 SQLAlchemy 의
+:class:`~sqlalchemy.ext.asyncio.AsyncSession` 으로 실행해서 이벤트 루프를
+막지 않습니다. 파이썬 3.5 이상과 SQLAlchemy 1.4 이상이 필요합니다.
+
+.. code-block:: python
+
+   from dodotable.aio import AsyncTable
+   from dodotable.environment import AsyncEnvironment
+
+   class Environment(AsyncEnvironment):
+
+       def get_session(self):
+           return request_scoped_session()
+
+       def create_session(self):
+           return AsyncSession(engine)
+
+   class Table(AsyncTable):
+
+       environment = Environment()
+
+   table = Table(cls=Music, label=u'music', columns=[...])
+   await table.select(offset, limit)
+   html = table.__html__()
+
+"""
+import asyncio
+import inspect
+
+from sqlalchemy.orm import Query
+from sqlalchemy.sql.expression import func, select
+
+from .schema import Pager, Table
+
+
+__all__ = 'AsyncTable',
+
+
+class AsyncTable(Table):
+    """:meth:`select` 가 코루틴인 :class:`~dodotable.schema.Table`.
+
+    페이지 쿼리와 ``COUNT(*)`` 쿼리를 :func:`asyncio.gather` 로 동시에
+    실행합니다. :class:`~sqlalchemy.ext.asyncio.AsyncSession` 하나로는 두 쿼리를
+    동시에 실행할 수 없으므로 행의 수는
+    :meth:`AsyncEnvironment.create_session()
+    <dodotable.environment.AsyncEnvironment.create_session>` 이 만든 세션으로
+    셉니다. 새 세션을 만들 수 없으면 두 쿼리를 차례로 실행합니다.
+
+    렌더링은 동기적으로 하므로 셀을 만들 때 지연 로딩이 일어나면 안 됩니다.
+    관계를 따라가는 열은 ``eager_load`` 로 미리 읽고,
+    :class:`~dodotable.schema.LinkedColumn` 의 ``endpoint`` 가 읽는 경로는
+    ``endpoint_attrs`` 로 알려주세요.
+
+    ``counter`` 로 코루틴 함수를 줄 수도 있습니다. ``cache`` 에서 HTML을
+    찾아도 :meth:`to_dict` 가 행을 동기적으로 가져올 수 없으므로
+    :meth:`select` 가 페이지의 행은 가져옵니다(``result_cache`` 가 있으면
+    먼저 찾아봅니다). ``COUNT(*)`` 쿼리와 렌더링은 하지 않습니다.
+    :meth:`iter_html`, :meth:`seek`, :meth:`export` 는 지원하지 않습니다.
+
+    """
+
+    async def select(self, offset=Pager.DEFAULT_OFFSET,
+                     limit=Pager.DEFAULT_LIMIT):
+        self._count = None
+        query = self.query.offset(offset).limit(limit)
+        if self._load_cached_page(query, offset, limit):
+            # to_dict() can't await the rows the fragment cache skipped
+            query = self._pop_skipped_page()
+            if query is not None:
+                results = await self._fetch(query, self.session)
+                self._store_page(list(self._iter_rows(results)))
+        else:
+            if self._use_window_count(query):
+                results = await self._fetch_page_with_window_count(query)
+            else:
+                results = await self._fetch_page_and_count(query)
+            self._store_page(list(self._iter_rows(results)))
+        self.pager = Pager(limit=limit, offset=offset,
+                           count=self.count)
+        self.pager.environment = self.environment
+        return self
+
+    async def fetch_count(self, session=None):
+        """필터가 적용된 행의 수를 셉니다.
+
+        :param session: ``COUNT(*)`` 쿼리를 실행할 세션.
+                        생략하면 :attr:`session` 을 씁니다.
+        :type session: :class:`~sqlalchemy.ext.asyncio.AsyncSession`
+        :return: 행의 수
+        :rtype: :class:`int`
+
+        """
+        if self._count is None:
+            query = self.build_base_query()
+            if self.counter is None:
+                statement = select(func.count()).select_from(
+                    query.statement.subquery()
+                )
+                count = await (session or self.session).scalar(statement)
+            elif callable(self.counter):
+                count = self.counter(query)
+                if inspect.isawaitable(count):
+                    count = await count
+            else:
+                count = self.counter
+            self._count = int(count)
+        return self._count
+
+    @property
+    def count(self):
+        """필터가 적용된 행의 수. :meth:`select` 나 :meth:`fetch_count` 가
+        센 값입니다."""
+        if self._count is None:
+            raise RuntimeError('{0.__class__.__name__}.count is not fetched '
+                               'yet; await select() or fetch_count() '
+                               'first'.format(self))
+        return self._count
+
+    async def _fetch(self, query, session):
+        result = (await session.execute(query.statement)).unique()
+        if len(query.column_descriptions) == 1:
+            result = result.scalars()
+        return result.all()
+
+    async def _fetch_page_and_count(self, query):
+        """페이지와 행의 수를 가능하면 동시에 가져옵니다."""
+        session = None
+        if self.counter is None:
+            create_session = getattr(self.environment, 'create_session', None)
+            if create_session is not None:
+                session = create_session()
+        if session is None:
+            results = await self._fetch(query, self.session)
+            await self.fetch_count()
+            return results
+        page = asyncio.ensure_future(self._fetch(query, self.session))
+        count = asyncio.ensure_future(self.fetch_count(session))
+        try:
+            # unlike gather(), wait() doesn't return as soon as one of them
+            # fails, so the count is done before its session is closed
+            await asyncio.wait((page, count))
+        finally:
+            for task in page, count:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(page, count, return_exceptions=True)
+            await session.close()
+        results = page.result()
+        count.result()
+        return results
+
+    async def _fetch_page_with_window_count(self, query):
+        """``count(*) OVER ()`` 를 붙인 쿼리로 페이지와 행의 수를 함께
+        가져옵니다."""
+        total = func.count().over().label('dodotable_count')
+        result = await self.session.execute(query.add_columns(total).statement)
+        results = result.unique().all()
+        if results:
+            self._count = int(results[0][-1])
+        else:
+            await self.fetch_count()
+        return [result[0] for result in results]
+
+    def _entity_query(self):
+        # the statement is executed by the async session, not by the query
+        return Query(self.cls)
+
+    def _get_bind(self, query):
+        return self.session.get_bind()
+
+    def iter_html(self, *args, **kwargs):
+        raise NotImplementedError('{0.__class__.__name__} does not support '
+                                  'iter_html()'.format(self))
+
+    def seek(self, *args, **kwargs):
+        raise NotImplementedError('{0.__class__.__name__} does not support '
+                                  'seek()'.format(self))
+
+    def export(self, *args, **kwargs):
+        raise NotImplementedError('{0.__class__.__name__} does not support '
+                                  'export()'.format(self))
@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+""":mod:`dodotable.cache` --- rendered table cache
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+같은 쿼리 스트링으로 자주 열리지만 데이터는 드물게 바뀌는 테이블을 위해
+렌더링된 HTML을 캐시합니다.
+
+.. code-block:: python
+
+   from dodotable.cache import FragmentCache, LRUCache
+
+   fragment_cache = FragmentCache(LRUCache(maxsize=512), timeout=60)
+
+   table = Table(cls=Music, ..., cache=fragment_cache)
+   html = table.select(offset, limit).__html__()
+
+   # 데이터가 바뀌면 해당 엔티티를 쓰는 테이블의 캐시를 버립니다.
+   fragment_cache.invalidate(Music)
+
+백엔드는 :class:`CacheBackend` 의 ``get``, ``set``, ``delete`` 만 있으면 되므로
+cachelib_ 의 캐시들(Redis, Memcached 등)을 그대로 쓸 수 있습니다.
+
+.. _cachelib: https://github.com/pallets/cachelib
+
+"""
+import collections
+import hashlib
+import threading
+import time
+import uuid
+
+from six import text_type
+from sqlalchemy import inspect
+
+
+__all__ = (
+    'CacheBackend', 'EntityCache', 'FragmentCache', 'LRUCache',
+    'ResultCache', 'related_entities', 'statement_key',
+)
+
+
+#: 만료 시각을 잴 시계
+_clock = getattr(time, 'monotonic', time.time)
+
+
+class CacheBackend(object):
+    """캐시 백엔드의 인터페이스."""
+
+    def get(self, key):
+        """``key`` 의 값을 가져옵니다.
+
+        :param str key:
+        :return: 저장된 값. 없거나 만료되었으면 :const:`None`
+
+        """
+        raise NotImplementedError()
+
+    def set(self, key, value, timeout=None):
+        """``key`` 에 ``value`` 를 저장합니다.
+
+        :param str key:
+        :param value:
+        :param int timeout: 초 단위의 유효 시간. :const:`None` 이면 백엔드의
+                            기본값을 쓰고, ``0`` 이면 만료되지 않습니다.
+
+        """
+        raise NotImplementedError()
+
+    def delete(self, key):
+        """``key`` 의 값을 버립니다.
+
+        :param str key:
+
+        """
+        raise NotImplementedError()
+
+
+class LRUCache(CacheBackend):
+    """프로세스 안에 최대 ``maxsize`` 개의 값을 유지하는 백엔드.
+
+    가장 오래 쓰이지 않은 값부터 버립니다.
+
+    :param int maxsize: 유지할 값의 최대 개수
+    :param int timeout: 기본 유효 시간(초). 생략하면 만료되지 않습니다.
+
+    """
+
+    def __init__(self, maxsize=1024, timeout=None):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._values = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._values.pop(key, None)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires is not None and expires <= _clock():
+                return None
+            self._values[key] = entry
+            return value
+
+    def set(self, key, value, timeout=None):
+        if timeout is None:
+            timeout = self.timeout
+        expires = _clock() + timeout if timeout else None
+        with self._lock:
+            self._values.pop(key, None)
+            self._values[key] = value, expires
+            while len(self._values) > self.maxsize:
+                self._values.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._values.pop(key, None)
+
+    def __len__(self):
+        return len(self._values)
+
+
+#: :func:`statement_key` 가 SQL 문의 구조마다 컴파일해 둔 결과
+_compiled_statements = LRUCache(maxsize=512)
+
+
+def statement_key(query):
+    """쿼리를 데이터베이스 방언으로 컴파일한 SQL 문과 바인드 파라미터.
+
+    SQLAlchemy 1.4 이상에서는 바인드 파라미터의 값만 다른 쿼리끼리 컴파일한
+    결과를 재사용하므로, 같은 모양의 테이블은 요청마다 SQL 문을 다시
+    컴파일하지 않습니다.
+
+    :param query: 키를 만들 쿼리
+    :type query: :class:`~sqlalchemy.orm.query.Query`
+    :return: ``(SQL 문, ((파라미터 이름, 값), ...))``
+    :rtype: :class:`tuple`
+
+    """
+    statement = query.statement
+    bind = query.session.get_bind() if query.session is not None else None
+    dialect = None if bind is None else bind.dialect
+    generate_cache_key = getattr(statement, '_generate_cache_key', None)
+    cache_key = generate_cache_key() if generate_cache_key else None
+    if cache_key is None:
+        # SQLAlchemy < 1.4, or the statement is not cacheable
+        compiled = statement.compile(dialect=dialect)
+        params = compiled.params
+    else:
+        key = dialect, cache_key.key
+        compiled = _compiled_statements.get(key)
+        if compiled is None:
+            compiled = statement.compile(dialect=dialect,
+                                         cache_key=cache_key)
+            _compiled_statements.set(key, compiled)
+        params = compiled.construct_params(
+            extracted_parameters=cache_key.bindparams
+        )
+    return text_type(compiled), tuple(sorted(params.items()))
+
+
+class EntityCache(object):
+    """엔티티 단위로 무효화할 수 있는 캐시.
+
+    :meth:`invalidate` 는 엔티티마다 세대(generation) 값을 바꿔서 그 엔티티를
+    읽는 테이블의 키를 모두 무효로 만듭니다. 세대 값도 백엔드에 저장하므로
+    여러 프로세스가 같은 백엔드를 쓰면 함께 무효화되고, 같은 백엔드와
+    ``prefix`` 를 쓰는 :class:`FragmentCache` 와 :class:`ResultCache` 도 함께
+    무효화됩니다.
+
+    :param backend: 캐시 백엔드. 생략하면 :class:`LRUCache` 를 씁니다.
+    :type backend: :class:`CacheBackend`
+    :param int timeout: 캐시된 값의 유효 시간(초).
+                        생략하면 백엔드의 기본값을 씁니다.
+    :param str prefix: 백엔드에 저장할 키의 접두어
+
+    """
+
+    #: (:class:`str`) 캐시 종류마다 키를 구분하는 이름
+    namespace = None
+
+    def __init__(self, backend=None, timeout=None, prefix='dodotable:'):
+        if backend is None:
+            backend = LRUCache()
+        self.backend = backend
+        self.timeout = timeout
+        self.prefix = prefix
+
+    def _generation_key(self, entity):
+        return '{0}generation:{1.__module__}.{1.__name__}'.format(self.prefix,
+                                                                  entity)
+
+    def generation(self, entity):
+        """``entity`` 의 현재 세대 값을 가져옵니다.
+
+        :param entity: 매핑된 클래스
+        :return: 세대 값
+        :rtype: :class:`str`
+
+        """
+        key = self._generation_key(entity)
+        generation = self.backend.get(key)
+        if generation is None:
+            # a generation evicted from the backend must not fall back to
+            # a value that keys written before an invalidation were using
+            generation = uuid.uuid4().hex
+            self.backend.set(key, generation, timeout=0)
+        return generation
+
+    def invalidate(self, entity):
+        """``entity`` 를 읽는 테이블들의 캐시를 버립니다.
+
+        :param entity: 매핑된 클래스
+
+        """
+        self.backend.set(self._generation_key(entity), uuid.uuid4().hex,
+                         timeout=0)
+
+    def key(self, parts, entities=()):
+        """``parts`` 와 ``entities`` 의 세대 값으로 캐시 키를 만듭니다.
+
+        :param parts: 렌더링 결과를 구분하는 값들. :func:`repr` 로 씁니다.
+        :type parts: :class:`tuple`
+        :param entities: 렌더링 결과가 읽는 매핑된 클래스들
+        :return: 백엔드에 쓸 키
+        :rtype: :class:`str`
+
+        """
+        generations = tuple(self.generation(entity) for entity in entities)
+        digest = hashlib.sha1(
+            repr((parts, generations)).encode('utf-8')
+        ).hexdigest()
+        return '{0}{1}:{2}'.format(self.prefix, self.namespace, digest)
+
+    def get(self, key):
+        """캐시된 값을 가져옵니다. 없으면 :const:`None`"""
+        return self.backend.get(key)
+
+    def set(self, key, value):
+        """값을 저장합니다."""
+        self.backend.set(key, value, timeout=self.timeout)
+
+
+class FragmentCache(EntityCache):
+    """렌더링된 테이블 HTML의 캐시.
+
+    :class:`~dodotable.schema.Table` 에 ``cache`` 로 넘기면
+    :meth:`~dodotable.schema.Table.select` 가 테이블, SQL 문과 바인드
+    파라미터, 오프셋, 리밋, 로케일로 키를 만들고 캐시된 HTML이 있으면
+    쿼리를 실행하지 않습니다.
+
+    """
+
+    namespace = 'fragment'
+
+
+class ResultCache(EntityCache):
+    """:meth:`~dodotable.schema.Table.select` 가 가져온 페이지의 캐시.
+
+    :class:`~dodotable.schema.Table` 에 ``result_cache`` 로 넘기면 페이지의
+    행들을 보이는 열의 값의 튜플로, 행의 수와 함께 저장합니다. 키는 페이지
+    쿼리의 SQL 문과 바인드 파라미터, 열들로 만들므로 로케일이나 템플릿이
+    다른 같은 목록끼리 데이터베이스 조회 한 번을 나눠 씁니다.
+
+    """
+
+    namespace = 'result'
+
+
+def related_entities(entity, paths):
+    """``entity`` 와 ``paths`` 가 관계를 따라 읽는 매핑된 클래스들.
+
+    :param entity: 매핑된 클래스
+    :param paths: ``.`` 으로 구분된 attribute 경로들
+    :return: 매핑된 클래스들
+    :rtype: :class:`list`
+
+    """
+    entities = [entity]
+    for path in paths:
+        if path is None:
+            continue
+        mapper = inspect(entity)
+        for name in path.split('.'):
+            prop = mapper.relationships.get(name)
+            if prop is None:
+                break
+            mapper = prop.mapper
+            if mapper.class_ not in entities:
+                entities.append(mapper.class_)
+    return entities
@@ -3,14 +3,20 @@
 ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
 """
-from six import string_types
+from six import string_types, text_type
 from sqlalchemy.sql.expression import asc, desc, false, null, or_
 
 from .exc import BadChoice
 from .schema import Queryable, Renderable, Schema
+from .search import Contains
 from .util import camel_to_underscore, _get_data
 
 
+#: (:class:`~dodotable.search.SearchStrategy`) :class:`Ilike` 가 기본으로
+#: 쓰는 검색 방법
+DEFAULT_STRATEGY = Contains()
+
+
 class _Filter(Schema):
     """Base class for filter results of table."""
 
@@ -39,7 +45,7 @@ class SelectFilter(_Filter, Queryable, Renderable):
         self.default = default
 
     def __query__(self):
-        arg_name = 'select.{}'.format(self.attribute_name)
+        arg_name = self.arg_name
         s = self.request_args.get(arg_name, self.default)
         choices = [c['name'] for c in self.choices]
         if not s:
@@ -55,9 +61,29 @@ class SelectFilter(_Filter, Queryable, Renderable):
             q = self.attribute == s
         return q
 
+    #: (:class:`str`) :meth:`__json__` 이 알려주는 필터의 종류
+    kind = 'select'
+
+    @property
+    def arg_name(self):
+        """(:class:`str`) 선택한 값을 담는 쿼리 스트링의 이름"""
+        return 'select.{}'.format(self.attribute_name)
+
     def __html__(self):
         return self.render('select_filter.html', filter=self)
 
+    def __json__(self):
+        return {
+            'kind': self.kind,
+            'name': self.arg_name,
+            'value': self.request_args.get(self.arg_name, self.default),
+            'choices': [
+                {'name': choice['name'],
+                 'description': text_type(choice['description'])}
+                for choice in self.choices
+            ],
+        }
+
 
 class NullSelectableSelectFilter(SelectFilter):
 
@@ -66,7 +92,7 @@ class NullSelectableSelectFilter(SelectFilter):
 
     def __query__(self):
         q = super(NullSelectableSelectFilter, self).__query__()
-        arg_name = 'select.{}'.format(self.attribute_name)
+        arg_name = self.arg_name
         s = self.request_args.get(arg_name, self.default)
         if s == self.NULL:
             q = self.attribute.is_(null())
@@ -100,22 +126,32 @@ class Ilike(Queryable):
     :param cls:
     :param attribute_name:
     :param request_args:
+    :param strategy: 검색어로 조건을 만드는 방법.
+                     생략하면 :class:`~dodotable.search.Contains`
+    :type strategy: :class:`~dodotable.search.SearchStrategy`
 
     """
 
-    def __init__(self, cls, attribute_name, request_args):
+    def __init__(self, cls, attribute_name, request_args, strategy=None):
         self.cls = cls
         self.attribute = getattr(cls, attribute_name)
         self.attribute_name = attribute_name
         self.request_args = request_args
+        self.strategy = strategy or DEFAULT_STRATEGY
+        self._search_name = create_search_name(
+            camel_to_underscore(cls.__name__)
+        )
 
     def __query__(self):
-        name = create_search_name(camel_to_underscore(self.cls.__name__))
+        return self._criterion(self.strategy)
+
+    def _criterion(self, strategy):
+        name = self._search_name
         type_ = self.request_args.get(name['type'])
         word = self.request_args.get(name['word'])
         q = None
         if type_ == self.attribute_name:
-            q = self.attribute.ilike(u'%{word}%'.format(word=word))
+            q = strategy.criterion(self.attribute, word)
         return q
 
 
@@ -126,21 +162,29 @@ class IlikeAlias(Ilike):
     :param alias_attr:
     :param request_args:
     :type request_args: :class:`~collections.abc.Mapping`
+    :param strategy: 검색어로 조건을 만드는 방법.
+                     생략하면 :class:`~dodotable.search.Contains`
+    :type strategy: :class:`~dodotable.search.SearchStrategy`
 
     """
 
-    def __init__(self, identifier, alias_attr, request_args):
+    def __init__(self, identifier, alias_attr, request_args, strategy=None):
         self.identifier = identifier
         self.alias_attr = alias_attr
         self.request_args = request_args
+        self.strategy = strategy or DEFAULT_STRATEGY
+        self._search_name = create_search_name(identifier)
 
     def __query__(self):
-        name = create_search_name(self.identifier)
+        return self._criterion(self.strategy)
+
+    def _criterion(self, strategy):
+        name = self._search_name
         word = self.request_args.get(name['word'])
         type = self.request_args.get(name['type'])
         q = None
         if word and type == self.alias_attr.name:
-            q = self.alias_attr.ilike(u'%{word}%'.format(word=word))
+            q = strategy.criterion(self.alias_attr, word)
         return q
 
 
@@ -151,7 +195,7 @@ class Equal(Ilike):
         self.type_ = type_
 
     def __query__(self):
-        name = create_search_name(camel_to_underscore(self.cls.__name__))
+        name = self._search_name
         type_ = self.request_args.get(name['type'])
         word = self.request_args.get(name['word'])
         q = None
@@ -171,7 +215,7 @@ class EqualAlias(IlikeAlias):
         self.type_ = type_
 
     def __query__(self):
-        name = create_search_name(self.identifier)
+        name = self._search_name
         word = self.request_args.get(name['word'])
         type = self.request_args.get(name['type'])
         q = None
@@ -206,11 +250,15 @@ class IlikeSet(_Filter, Queryable, Renderable):
     :param request_args:
     :type request_args: :class:`~collections.abc.Mapping`
     :param identifier:
+    :param index: 메모리에서 검색할 색인. 색인에 있는 attribute 의
+                  :class:`Ilike` 필터는 데이터베이스 대신 색인으로 찾습니다.
+    :type index: :class:`~dodotable.search.SearchIndex`
 
     """
 
-    def __init__(self, table, request_args, identifier=None):
+    def __init__(self, table, request_args, identifier=None, index=None):
         self.table = table
+        self.index = index
         if not identifier:
             identifier = camel_to_underscore(table.cls.__name__)
         name = create_search_name(identifier)
@@ -222,14 +270,37 @@ class IlikeSet(_Filter, Queryable, Renderable):
         filter_ = []
         for column in self.table._columns:
             for f in column.filters:
-                if isinstance(f, Ilike) and f.__query__() is not None:
-                    filter_.append(f.__query__())
+                if isinstance(f, Ilike):
+                    q = self._filter_query(f)
+                    if q is not None:
+                        filter_.append(q)
 
         return or_(*filter_) if filter_ else None
 
+    def _filter_query(self, f):
+        if self.index is not None and \
+           not isinstance(f, (Equal, EqualAlias)) and \
+           self.index.covers(getattr(f, 'attribute', None)):
+            return f._criterion(self.index)
+        return f.__query__()
+
     def __html__(self):
         return self.render('ilike_set.html', filter=self)
 
+    def __json__(self):
+        return {
+            'kind': 'search',
+            'name': self.arg_name,
+            'value': self.request_args.get(self.arg_name, ''),
+            'type_name': self.arg_type_name,
+            'type_value': self.request_args.get(self.arg_type_name, ''),
+            'columns': [
+                {'attr': column.attr, 'label': text_type(column.label)}
+                for column in self.table._columns
+                if any(isinstance(f, Ilike) for f in column.filters)
+            ],
+        }
+
 
 class Order(Queryable):
     """정렬 조건을 내보냅니다.
@@ -248,6 +319,7 @@ class Order(Queryable):
     def __init__(self, cls, attribute_name, order=None):
         self.cls = cls
         self.order = order or self.DESCENDANT
+        self.attribute_name = attribute_name
         self.attribute = _get_data(cls, attribute_name, attribute_name)
 
     @classmethod
@@ -20,14 +20,181 @@ So, you have to inherit environment class and implement some methods,
 - :meth:`dodotable.environment.Environment.build_url`
 - :meth:`dodotable.environment.Environment.get_session`
 
+Tables on asyncio (:class:`dodotable.aio.AsyncTable`) use
+:class:`dodotable.environment.AsyncEnvironment` instead, whose
+:meth:`~dodotable.environment.AsyncEnvironment.get_session` returns
+a :class:`sqlalchemy.ext.asyncio.AsyncSession`.
+
 A good example is :class:`dodotable.environment.flask.FlaskEnvironment`.
 more examples are in it.
 
 """
 import gettext
+import os
 import os.path
 
-__all__ = 'Environment',
+from six import PY2
+try:
+    from babel.core import Locale, UnknownLocaleError
+except ImportError:
+    Locale = UnknownLocaleError = None
+
+from ..util import TemplateGlobals
+
+__all__ = (
+    'AsyncEnvironment', 'CATALOGS', 'Environment', 'load_translations',
+    'normalize_locale', 'preload_translations', 'resolve_class',
+)
+
+
+#: (:class:`str`) 번역 카탈로그가 있는 디렉토리
+LOCALE_DIR = os.path.join(os.path.dirname(__file__), '..', 'locale')
+
+
+def _list_catalogs():
+    try:
+        names = os.listdir(LOCALE_DIR)
+    except OSError:
+        return frozenset()
+    return frozenset(name for name in names
+                     if os.path.isdir(os.path.join(LOCALE_DIR, name)))
+
+
+#: (:class:`frozenset`) dodotable에 들어있는 번역 카탈로그의 로케일들
+CATALOGS = _list_catalogs()
+
+#: (:class:`int`) :func:`normalize_locale` 가 기억해둘 로케일의 최대 개수
+NORMALIZED_LOCALES_MAXSIZE = 256
+
+_normalized_locales = {}
+_translations = {}
+
+
+def normalize_locale(locale):
+    """``'ko-kr'`` 같은 로케일을 ``'ko_KR'`` 처럼 정규화합니다.
+
+    Babel_ 이 있으면 :meth:`babel.core.Locale.parse` 로 해석합니다. Babel 이
+    없거나 해석할 수 없으면 :data:`CATALOGS` 중에서 맞는 로케일을 찾고, 그것도
+    없으면 :const:`None` 을 돌려줍니다. 요청에서 온 아무 문자열이나 캐시의
+    키로 쓰지 않도록 번역과 jinja 환경은 이 값을 키로 씁니다.
+
+    .. _Babel: http://babel.pocoo.org/
+
+    :param locale: 로케일. :class:`babel.core.Locale` 도 쓸 수 있습니다.
+    :return: 정규화한 로케일. 알 수 없는 로케일이면 :const:`None`
+    :rtype: :class:`str`
+
+    """
+    if locale is None:
+        return None
+    elif not isinstance(locale, str):
+        # locale might be an instance of babel.core.Locale
+        locale = str(locale)
+    try:
+        return _normalized_locales[locale]
+    except KeyError:
+        pass
+    normalized = _parse_locale(locale)
+    if len(_normalized_locales) < NORMALIZED_LOCALES_MAXSIZE:
+        _normalized_locales[locale] = normalized
+    return normalized
+
+
+def _parse_locale(locale):
+    locale = locale.replace('-', '_')
+    if Locale is not None:
+        try:
+            return str(Locale.parse(locale))
+        except (ValueError, TypeError, UnknownLocaleError):
+            pass
+    language, _, territory = locale.partition('_')
+    candidates = [language.lower()]
+    if territory:
+        candidates.insert(0, language.lower() + '_' + territory.upper())
+    for candidate in candidates:
+        if candidate in CATALOGS:
+            return candidate
+    return None
+
+
+def load_translations(locale):
+    """``locale`` 의 번역을 가져옵니다.
+
+    번역은 :func:`normalize_locale` 로 정규화한 로케일마다 한 번만 읽어서
+    캐시하므로 같은 로케일로 다시 부르면 파일 시스템을 뒤지지 않고 바로
+    돌려줍니다.
+
+    :param locale: 로케일. :class:`babel.core.Locale` 도 쓸 수 있습니다.
+    :return: 번역. 카탈로그가 없으면 :class:`gettext.NullTranslations`
+    :rtype: :class:`gettext.NullTranslations`
+
+    """
+    locale = normalize_locale(locale)
+    try:
+        return _translations[locale]
+    except KeyError:
+        pass
+    if locale is None:
+        translations = gettext.NullTranslations()
+    else:
+        # If the locale has territory (e.g. 'ko_KR')
+        # we can search the proper match (e.g. ko_KR) and then
+        # the non-territory match (e.g. ko) as a fallback.
+        languages = [locale]
+        if '_' in locale:
+            languages.append(locale[:locale.index('_')])
+        kwargs = {'codeset': 'utf-8'} if PY2 else {}
+        translations = gettext.translation(
+            'dodotable',
+            LOCALE_DIR,
+            fallback=True,
+            languages=languages,
+            **kwargs
+        )
+    return _translations.setdefault(locale, translations)
+
+
+_classes = {}
+
+
+def resolve_class(name):
+    """``'dodotable.helper:Category'`` 같은 이름의 클래스를 가져옵니다.
+
+    한 번 찾은 클래스는 캐시하므로 같은 이름으로 다시 부르면 모듈을 다시
+    import 하지 않습니다.
+
+    :param str name: ``'모듈:클래스'`` 형식의 이름
+    :return: 클래스. 찾을 수 없으면 :const:`None`
+
+    """
+    try:
+        return _classes[name]
+    except KeyError:
+        pass
+    try:
+        module_name, class_name = name.split(':')
+        module = __import__(module_name, globals(), locals(), [class_name], 0)
+        cls = getattr(module, class_name)
+    except (ImportError, ValueError, AttributeError):
+        cls = None
+    return _classes.setdefault(name, cls)
+
+
+def preload_translations():
+    """dodotable에 들어있는 모든 번역 카탈로그를 미리 읽어둡니다."""
+    for locale in CATALOGS:
+        load_translations(locale)
+
+
+def _is_data_descriptor(cls, name):
+    """``cls`` 의 ``name`` 이 프로퍼티처럼 읽을 때마다 값을 계산하는
+    descriptor 인지 확인합니다."""
+    for klass in cls.__mro__:
+        if name in vars(klass):
+            attribute = vars(klass)[name]
+            return hasattr(type(attribute), '__set__') or \
+                hasattr(type(attribute), '__delete__')
+    return False
 
 
 class Environment(object):
@@ -45,7 +212,7 @@ class Environment(object):
     """
 
     #: (:class:`tuple`) methods that
-    __env_methods__ = 'get_session',
+    __env_methods__ = 'get_session', 'create_session', 'cache_key'
 
     def __init__(self, locale_selector=None):
         if not (locale_selector is None or callable(locale_selector)):
@@ -57,6 +224,10 @@ class Environment(object):
     def template_loader(self):
         """Get custom template loader
 
+        Compiled templates are cached per loader (see
+        :data:`dodotable.util.environment_cache`), so return the same
+        loader instance every time instead of creating a new one.
+
         :return: jinja template loader
         :rtype: :class:`jinja2.loaders.BaseLoader`
 
@@ -69,47 +240,111 @@ class Environment(object):
     def get_session(self):
         raise NotImplementedError()
 
+    def create_session(self):
+        """Create a new session which is used concurrently with
+        :meth:`get_session`'s one, e.g. to count rows on another connection
+        while a table fetches a page.  The table closes it when it's done.
+
+        :return: a new session, or :const:`None` to run statements
+                 one by one on :meth:`get_session`'s session
+        :rtype: :class:`~sqlalchemy.orm.session.Session`
+
+        """
+        return None
+
+    def cache_key(self):
+        """Get a value which distinguishes rendered HTML between requests
+        apart from the query, e.g. the current URL that :meth:`build_url`
+        builds links from.  :class:`dodotable.cache.FragmentCache` adds it
+        to its keys.
+
+        :return: a hashable value with a stable :func:`repr`
+
+        """
+        return None
+
     def get_translations(self):
         if self.get_locale is None:
             return None
         locale = self.get_locale()
         if locale is None:
             return None
-        elif not isinstance(locale, str):
-            # locale might be an instance of babel.core.Locale
-            locale = str(locale)
-        if '_' in locale or '-' in locale:
-            # If the locale has territory (e.g. 'ko_KR')
-            # we can search the proper match (e.g. ko_KR) and then
-            # the non-territory match (e.g. ko) as a fallback.
-            locale = locale.replace('-', '_')
-            locales = [locale, locale[:locale.index('_')]]
-        else:
-            locales = [locale]
-        return gettext.translation(
-            'dodotable',
-            os.path.join(os.path.dirname(__file__), '..', 'locale'),
-            fallback=True,
-            codeset='utf-8',
-            languages=locales
-        )
+        return load_translations(locale)
 
     def isinstance(self, instance, cls):
         if not isinstance(cls, type):
-            try:
-                name = cls.split(':')
-                _mod = __import__(name[0], globals(), locals(), [name[1]], 0)
-                mod = getattr(_mod, name[1])
-            except (ImportError, IndexError):
+            cls = resolve_class(cls)
+            if cls is None:
                 return False
-        else:
-            mod = cls
-        return isinstance(instance, mod)
+        return isinstance(instance, cls)
+
+    def __setattr__(self, name, value):
+        super(Environment, self).__setattr__(name, value)
+        if name != '_template_globals':
+            # attributes are exposed to templates so build them again
+            self._template_globals = None
+
+    @property
+    def template_globals(self):
+        """(:class:`~dodotable.util.TemplateGlobals`) 템플릿에서 쓸 수 있는
+        attribute 들의 바뀌지 않는 매핑.
+
+        처음 읽을 때 한 번만 만들어두고 환경의 attribute 가 바뀔 때만 다시
+        만듭니다. 메서드처럼 호출할 수 있는 attribute 만 담아두고
+        :func:`dodotable.util.render` 가 캐시된 jinja 환경의 전역 변수로 한
+        번만 넣어둡니다. 요청마다 값이 달라질 수 있는 프로퍼티와 호출할 수
+        없는 attribute 는 렌더링할 때마다 다시 읽습니다.
+
+        """
+        template_globals = getattr(self, '_template_globals', None)
+        if template_globals is None:
+            frozen = {}
+            dynamic_names = []
+            # dir() can't see instance attributes since __dict__ is
+            # overridden by the method below
+            for attribute in set(dir(self)) | {'get_locale'}:
+                if attribute.startswith('__') or \
+                   attribute in self.__env_methods__ or \
+                   attribute in ('template_globals', '_template_globals'):
+                    continue
+                if _is_data_descriptor(type(self), attribute):
+                    dynamic_names.append(attribute)
+                    continue
+                value = getattr(self, attribute)
+                if callable(value):
+                    frozen[attribute] = value
+                else:
+                    dynamic_names.append(attribute)
+            template_globals = TemplateGlobals(self, frozen, dynamic_names)
+            self._template_globals = template_globals
+        return template_globals
 
     def __dict__(self):
-        env = {}
-        for attribute in dir(self):
-            if not (attribute.startswith('__') or
-                    attribute in self.__env_methods__):
-                env.update({attribute: getattr(self, attribute)})
-        return env
+        return dict(self.template_globals)
+
+
+class AsyncEnvironment(Environment):
+    """Environment for :class:`dodotable.aio.AsyncTable`.
+
+    :meth:`get_session` has to return an
+    :class:`~sqlalchemy.ext.asyncio.AsyncSession`.  Since an
+    :class:`~sqlalchemy.ext.asyncio.AsyncSession` can't run two statements
+    at once, implement :meth:`create_session` as well to let a table count
+    its rows on a separate session while it fetches a page.
+
+    """
+
+    def create_session(self):
+        """Create a new :class:`~sqlalchemy.ext.asyncio.AsyncSession`
+        which is used concurrently with :meth:`get_session`'s one.
+        The table closes it when it's done.
+
+        :return: a new session, or :const:`None` to run statements
+                 one by one on :meth:`get_session`'s session
+        :rtype: :class:`~sqlalchemy.ext.asyncio.AsyncSession`
+
+        """
+        return None
+
+
+preload_translations()
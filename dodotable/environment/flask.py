@@ -26,9 +26,7 @@ one of environment class, and use it in your table.
 
    class CustomEnvironment(FlaskEnvironment):
 
-       @property
-       def template_loader(self):
-           return PackageLoader('yourapplication', 'templates')
+       template_loader = PackageLoader('yourapplication', 'templates')
 
 
    class Column(SchemaColumn):
@@ -105,6 +103,9 @@ class FlaskEnvironment(Environment):
         else:
             return session
 
+    def cache_key(self):
+        return request.full_path
+
 
 def default_locale_selector():
     # FIXME
@@ -3,8 +3,12 @@
 ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
 """
-__all__ = 'BadChoice',
+__all__ = 'BadChoice', 'BadCursor',
 
 
 class BadChoice(Exception):
     """예상하지 못한 선택지를 골랐을 때 발생합니다."""
+
+
+class BadCursor(Exception):
+    """키셋 페이지네이션의 커서를 해석할 수 없을 때 발생합니다."""
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+""":mod:`dodotable.export` --- export tables as CSV or NDJSON
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+:class:`~dodotable.schema.Table` 의 필터와 정렬이 적용된 모든 행을 파일에
+씁니다. :class:`~dodotable.schema.Row` 나 :class:`~dodotable.schema.Cell` 을
+만들지 않고 데이터베이스에서 ``yield_per`` 개씩 읽어서 바로 쓰므로 행이 수백만
+개여도 메모리 사용량이 일정합니다.
+
+.. code-block:: python
+
+   table = Table(cls=Music, label=u'music', columns=[...])
+   with open('musics.csv', 'w', newline='') as f:
+       table.export(f, format='csv')
+
+"""
+import csv
+import json
+
+from six import PY2, integer_types, string_types, text_type
+
+from .util import string_literal
+
+
+__all__ = 'CSV', 'NDJSON', 'export'
+
+
+#: 쉼표로 구분된 값. 첫 줄은 열의 레이블입니다.
+CSV = 'csv'
+
+#: 한 줄에 행 하나씩, 열의 레이블을 키로 하는 JSON 객체
+NDJSON = 'ndjson'
+
+
+def export(table, fp, format=CSV, yield_per=1000):
+    """``table`` 의 보이는 열들을 ``fp`` 에 씁니다.
+
+    열의 값은 :class:`~dodotable.schema.Column` 의 ``_repr`` 로 바꿔서
+    씁니다. :const:`NDJSON` 은 ``_repr`` 을 바꾸지 않은 열의 문자열, 숫자,
+    :const:`None` 값은 그대로 씁니다.
+
+    :param table: 내보낼 테이블
+    :type table: :class:`~dodotable.schema.Table`
+    :param fp: 텍스트를 쓸 파일 객체. 파이썬 2에서는 바이트를 씁니다.
+    :param str format: :const:`CSV` or :const:`NDJSON`
+    :param int yield_per: 데이터베이스에서 한 번에 가져올 행의 수
+    :return: 쓴 행의 수
+    :rtype: :class:`int`
+
+    """
+    if format not in (CSV, NDJSON):
+        raise ValueError('unknown format: ' + repr(format))
+    columns = table.columns
+    getters = [_value_getter(column) for column in columns]
+    query = table.query.execution_options(stream_results=True) \
+                       .yield_per(yield_per)
+    if format == CSV:
+        writer = csv.writer(fp)
+        write = writer.writerow
+        write(_encode([text_type(column.label) for column in columns]))
+    else:
+        keys = [text_type(column.label) for column in columns]
+
+        def write(values):
+            fp.write(json.dumps(dict(zip(keys, values)),
+                                ensure_ascii=False, sort_keys=True))
+            fp.write(u'\n')
+    count = 0
+    for data in query:
+        values = [get(data) for get in getters]
+        if format == CSV:
+            values = _encode([_text(column, value)
+                              for column, value in zip(columns, values)])
+        else:
+            values = [_json_value(column, value)
+                      for column, value in zip(columns, values)]
+        write(values)
+        count += 1
+    return count
+
+
+def _value_getter(column):
+    """``column`` 이 셀에 채우는 값을 가져오는 함수를 만듭니다."""
+    from .schema import ObjectColumn
+    if isinstance(column, ObjectColumn):
+        return lambda data: data
+    getter = column._getter
+    return lambda data: getter(data, None)
+
+
+def _text(column, value):
+    return text_type(column._repr(value))
+
+
+def _json_value(column, value):
+    if column._repr is string_literal and (
+        value is None or
+        isinstance(value, string_types + integer_types + (float,))
+    ):
+        return value
+    return _text(column, value)
+
+
+if PY2:
+    def _encode(values):
+        return [value.encode('utf-8') for value in values]
+else:
+    def _encode(values):
+        return values
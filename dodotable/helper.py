@@ -21,6 +21,9 @@ class Limit(_Helper, Renderable, Queryable):
 
     """
 
+    #: (:class:`tuple`) 고를 수 있는 한 페이지의 행의 수
+    CHOICES = 10, 50, 100, 200
+
     def __init__(self, table, request_args, identifier=None):
         self.table = table
         self.request_args = request_args
@@ -31,9 +34,30 @@ class Limit(_Helper, Renderable, Queryable):
     def __query__(self):
         pass
 
+    @property
+    def value(self):
+        """(:class:`int`) 고른 한 페이지의 행의 수. 템플릿의 ``|int`` 처럼
+        숫자가 아니면 ``0`` 입니다."""
+        value = self.request_args.get('limit', 10)
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            try:
+                return int(float(value))
+            except (OverflowError, TypeError, ValueError):
+                return 0
+
     def __html__(self):
         return self.render('limit.html', filter=self)
 
+    def __json__(self):
+        return {
+            'kind': 'limit',
+            'name': self.arg_type_name,
+            'value': self.value,
+            'choices': list(self.CHOICES),
+        }
+
 
 class Category(_Helper, SelectFilter):
     """``select`` 태그로 렌더링되는 필터가 아닌
@@ -41,6 +65,8 @@ class Category(_Helper, SelectFilter):
 
     """
 
+    kind = 'category'
+
     def __html__(self):
         return self.render('category.html', filter=self)
 
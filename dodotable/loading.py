@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+""":mod:`dodotable.loading` --- loader options for table queries
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+:class:`~dodotable.schema.Table` 의 열들이 보여주는 attribute 경로를 보고
+:meth:`sqlalchemy.orm.query.Query.options` 에 넘길 로더 옵션을 만듭니다.
+
+"""
+import collections
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import joinedload, load_only, selectinload
+from sqlalchemy.orm.exc import UnmappedColumnError
+from sqlalchemy.orm.properties import ColumnProperty, RelationshipProperty
+
+
+__all__ = 'LoadPlan', 'StatementCounter',
+
+
+class LoadPlan(object):
+    """엔티티에서 읽어야 하는 칼럼과 관계를 트리로 나타냅니다.
+
+    .. code-block:: python
+
+       >>> plan = LoadPlan(Music, ['name', 'artist.name'])
+       >>> session.query(Music).options(*plan.options(projection=True))
+
+    :param entity: 매핑된 클래스
+    :param paths: ``.`` 으로 구분된 attribute 경로들.
+                  :const:`None` 은 엔티티 전체가 필요하다는 뜻입니다.
+
+    """
+
+    #: 관계를 ``selectinload`` 로 읽습니다.
+    SELECTIN = 'selectin'
+
+    #: 관계를 ``joinedload`` 로 읽습니다. 컬렉션(``uselist``) 관계는
+    #: 행이 늘어나고 ``yield_per`` 와 함께 쓸 수 없으므로
+    #: ``selectinload`` 로 읽습니다.
+    JOINED = 'joined'
+
+    def __init__(self, entity, paths=()):
+        self.entity = entity
+        self.mapper = inspect(entity)
+        #: (:class:`list`) 읽어야 하는 칼럼 attribute 이름
+        self.columns = []
+        #: (:class:`bool`) 칼럼을 고를 수 없어서 엔티티 전체를 읽어야 하는지
+        self.complete = False
+        #: (:class:`collections.OrderedDict`) 관계 이름과 그 관계의
+        #: :class:`LoadPlan`
+        self.relationships = collections.OrderedDict()
+        for path in paths:
+            self.add(path)
+
+    def add(self, path):
+        """``path`` 를 읽을 수 있도록 계획에 더합니다.
+
+        매핑된 칼럼이나 관계가 아닌 이름(파이썬 프로퍼티, hybrid 등)이 나오면
+        어떤 칼럼을 쓸지 알 수 없으므로 그 엔티티는 전체를 읽습니다.
+        ``lazy='dynamic'`` 관계처럼 미리 읽을 수 없는 관계도 마찬가지입니다.
+
+        :param str path: ``.`` 으로 구분된 attribute 경로
+
+        """
+        if path is None:
+            self.complete = True
+            return
+        name, _, rest = path.partition('.')
+        prop = self.mapper.attrs.get(name)
+        if isinstance(prop, RelationshipProperty) and \
+           prop.lazy not in ('dynamic', 'noload'):
+            plan = self.relationships.get(name)
+            if plan is None:
+                plan = LoadPlan(prop.mapper.class_)
+                self.relationships[name] = plan
+                self._add_columns(prop.local_columns)
+                plan._add_columns(prop.remote_side)
+            plan.add(rest or None)
+        elif isinstance(prop, ColumnProperty) and not rest:
+            self._add_column(name)
+        else:
+            self.complete = True
+
+    def _add_column(self, key):
+        if key not in self.columns:
+            self.columns.append(key)
+
+    def _add_columns(self, columns):
+        for column in columns:
+            try:
+                prop = self.mapper.get_property_by_column(column)
+            except UnmappedColumnError:
+                continue
+            self._add_column(prop.key)
+
+    def options(self, projection=False, strategy=SELECTIN):
+        """쿼리에 붙일 로더 옵션들을 만듭니다.
+
+        :param bool projection: 보여줄 칼럼만 ``load_only`` 로 읽습니다.
+        :param str strategy: 관계를 미리 읽는 방법.
+                             :const:`SELECTIN` or :const:`JOINED`
+        :return: :meth:`~sqlalchemy.orm.query.Query.options` 에 넘길 옵션들
+        :rtype: :class:`list`
+
+        """
+        if strategy not in (self.SELECTIN, self.JOINED):
+            raise ValueError('unknown strategy: ' + repr(strategy))
+        options = []
+        if projection and not self.complete:
+            options.append(load_only(*self._column_attributes()))
+        self._relationship_options(None, projection, strategy, options)
+        return options
+
+    def _column_attributes(self):
+        return [getattr(self.entity, key) for key in self.columns] or \
+            [getattr(self.entity, self.mapper.get_property_by_column(c).key)
+             for c in self.mapper.primary_key]
+
+    def _relationship_options(self, parent, projection, strategy, options):
+        for name, plan in self.relationships.items():
+            attribute = getattr(self.entity, name)
+            # joinedload of a collection multiplies rows and cannot be
+            # streamed with yield_per (iter_html, export)
+            if strategy == self.SELECTIN or attribute.property.uselist:
+                loader = selectinload(attribute) if parent is None \
+                    else parent.selectinload(attribute)
+            else:
+                loader = joinedload(attribute) if parent is None \
+                    else parent.joinedload(attribute)
+            if projection and not plan.complete:
+                options.append(loader.load_only(*plan._column_attributes()))
+            else:
+                options.append(loader)
+            plan._relationship_options(loader, projection, strategy, options)
+
+
+class StatementCounter(object):
+    """블록 안에서 실행된 SQL 문의 수를 셉니다.
+
+    N+1 문제처럼 렌더링 한 번에 쿼리가 얼마나 실행되는지 확인할 때 씁니다.
+
+    .. code-block:: python
+
+       >>> with StatementCounter(session) as counter:
+       ...     html = table.select(0, 100).__html__()
+       >>> counter.count
+       3
+
+    :param bind: 세션이나 엔진
+    :type bind: :class:`~sqlalchemy.orm.session.Session` or
+                :class:`~sqlalchemy.engine.Engine`
+    :param str keyword: 주면 이 문자열이 들어있는 SQL 문만 셉니다.
+                        대소문자를 구분하지 않도록 소문자로 주세요.
+
+    """
+
+    def __init__(self, bind, keyword=None):
+        if hasattr(bind, 'get_bind'):
+            bind = bind.get_bind()
+        self.engine = bind
+        self.keyword = keyword
+        #: (:class:`list`) 실행된 SQL 문
+        self.statements = []
+
+    @property
+    def count(self):
+        """(:class:`int`) 실행된 SQL 문의 수"""
+        return len(self.statements)
+
+    def _before_cursor_execute(self, conn, cursor, statement, *args):
+        if self.keyword is None or self.keyword in statement.lower():
+            self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute',
+                     self._before_cursor_execute)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        event.remove(self.engine, 'before_cursor_execute',
+                     self._before_cursor_execute)
@@ -5,22 +5,48 @@
 """
 from __future__ import absolute_import
 
+import base64
+import binascii
 import collections
 try:
     from collections.abc import MutableSequence
 except ImportError:
     from collections import MutableSequence
+import datetime
+import decimal
+import json
 import math
+import numbers
+import re
+import threading
+import timeit
+import uuid
 
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    ThreadPoolExecutor = None
+
+from six import binary_type, get_unbound_function, string_types, text_type
+from sqlalchemy import inspect
+from sqlalchemy.exc import UnboundExecutionError
 from sqlalchemy.orm import Query
+from sqlalchemy.sql.expression import (CompoundSelect, and_, asc, desc,
+                                       false, func, or_)
 
+from .cache import related_entities, statement_key
 from .environment.flask import FlaskEnvironment
-from .util import render, string_literal, _get_data
+from .exc import BadCursor
+from .loading import LoadPlan
+from .util import (data_getter, get_template, json_dumps, render, stream,
+                   string_literal, supports_window_functions, _get_data)
 
 
 __all__ = (
-    'Cell', 'Column', 'LinkedColumn', 'ObjectColumn', 'ENVIRONMENT',
+    'Cell', 'Column', 'Criteria', 'LinkedColumn', 'ObjectColumn',
+    'ENVIRONMENT',
     'Queryable', 'Renderable', 'Row', 'Table', 'Pager', 'Schema',
+    'SeekPager',
 )
 
 
@@ -35,11 +61,13 @@ class Schema(object):
 
     """
 
+    __slots__ = ()
+
     environment = ENVIRONMENT
 
     def render(self, template_name, **kwargs):
         return render(template_name,
-                      extra_environments=self.environment.__dict__(),
+                      extra_environments=self.environment.template_globals,
                       **kwargs)
 
 
@@ -63,6 +91,8 @@ class Renderable(object):
 
     """
 
+    __slots__ = ()
+
     def __html__(self):
         """:mod:`jinja` 내부 호출용 함수
 
@@ -73,6 +103,11 @@ class Renderable(object):
         """
         raise NotImplementedError('__html__ not implemented yet.')
 
+    def __json__(self):
+        """:meth:`Table.to_dict` 가 호출하는 함수. JSON으로 바꿀 수 있는
+        값을 돌려줍니다. 구현하지 않은 필터는 JSON에서 빠집니다."""
+        raise NotImplementedError('__json__ not implemented yet.')
+
 
 class Queryable(object):
     """:class:`~sqlalchemy.orm.query.Query` 로 변환 가능한 객체
@@ -83,6 +118,8 @@ class Queryable(object):
 
     """
 
+    __slots__ = ()
+
     def __query__(self):
         """모든 :class:`~dodotable.Queryable` 객체가 구현해야하는 메소드."""
         raise NotImplementedError('__query__ not implemented yet.')
@@ -94,8 +131,14 @@ class Cell(Schema, Renderable):
     :param int col: column 위치
     :param int row: row 위치
     :param data: 셀에 채워질 데이터
+
+    한 페이지에 셀이 수천 개씩 만들어지므로 ``__slots__`` 를 써서
+    인스턴스마다 ``__dict__`` 를 만들지 않습니다.
+
     """
 
+    __slots__ = 'col', 'row', 'data', 'repr', 'classes'
+
     def __init__(self, col, row, data, _repr=string_literal, classes=()):
         self.col = col
         self.row = row
@@ -106,6 +149,9 @@ class Cell(Schema, Renderable):
     def __html__(self):
         return self.render('cell.html', cell=self)
 
+    def __json__(self):
+        return text_type(self.repr(self.data))
+
 
 class LinkedCell(Cell):
     """컨텐츠에 링크가 걸린 Cell
@@ -117,6 +163,8 @@ class LinkedCell(Cell):
 
     """
 
+    __slots__ = 'url',
+
     def __init__(self, col, row, data, endpoint):
         self.col = col
         self.row = row
@@ -126,6 +174,9 @@ class LinkedCell(Cell):
     def __html__(self):
         return self.render('linkedcell.html', cell=self)
 
+    def __json__(self):
+        return {'value': string_literal(self.data), 'url': self.url}
+
 
 class Column(Schema, Renderable):
     """테이블의 열을 나타내는 클래스
@@ -158,6 +209,16 @@ class Column(Schema, Renderable):
         self.visible = visible
         self.classes = classes
 
+    @property
+    def attr(self):
+        """(:class:`str`) 가져올 attribute 이름"""
+        return self._attr
+
+    @attr.setter
+    def attr(self, attr):
+        self._attr = attr
+        self._getter = data_getter(attr)
+
     def add_filter(self, filter):
         self.filters.append(filter)
 
@@ -172,13 +233,37 @@ class Column(Schema, Renderable):
         :return:
         """
         return Cell(col=col, row=row,
-                    data=_get_data(data, attribute_name, default),
+                    data=self._cell_data(data, attribute_name, default),
                     _repr=self._repr,
                     classes=self.classes)
 
+    def _load_paths(self):
+        """셀을 만들 때 읽는 attribute 경로들.
+
+        :const:`None` 은 엔티티 전체를 읽는다는 뜻입니다.
+        :class:`~dodotable.loading.LoadPlan` 이 씁니다.
+
+        """
+        return self.attr,
+
+    def _cell_data(self, data, attribute_name, default):
+        # :attr:`attr` 은 열을 만들 때 컴파일해둔 함수로 가져옵니다.
+        if attribute_name == self._attr:
+            return self._getter(data, default)
+        return _get_data(data, attribute_name, default)
+
     def __html__(self):
         return self.render('column.html', column=self)
 
+    def __json__(self):
+        return {
+            'label': text_type(self.label),
+            'attr': self.attr,
+            'order': self.order_by,
+            'sortable': self.sortable,
+            'classes': list(self.classes),
+        }
+
 
 class LinkedColumn(Column):
     """링크가 걸려야 하는 열 나타내는 클래스
@@ -187,24 +272,33 @@ class LinkedColumn(Column):
     :param str attr: 가져올 attribute 이름
     :param str or function endpoint: 걸릴 링크 형식
     :param list order_by: 정렬 기준
+    :param endpoint_attrs: ``endpoint`` 함수가 읽는 attribute 경로들.
+                           주면 :class:`Table` 이 미리 읽어둡니다.
 
     """
 
     def __init__(self, *args, **kwargs):
         self.endpoint = kwargs.pop('endpoint')
+        self.endpoint_attrs = tuple(kwargs.pop('endpoint_attrs', ()))
         super(LinkedColumn, self).__init__(*args, **kwargs)
 
+    def _load_paths(self):
+        return (self.attr,) + self.endpoint_attrs
+
     def __cell__(self, col, row, data, attribute_name, default=None):
         endpoint = self.endpoint(data) if callable(
             self.endpoint) else self.endpoint
         return LinkedCell(col=col, row=row,
-                          data=_get_data(data, attribute_name, default),
+                          data=self._cell_data(data, attribute_name, default),
                           endpoint=endpoint)
 
 
 class ObjectColumn(Column):
     """Get __cell_.data as result instead of attribute."""
 
+    def _load_paths(self):
+        return None,
+
     def __cell__(self, col, row, data, attribute_name, default=None):
         return Cell(col=col, row=row,
                     data=data if data else default,
@@ -223,9 +317,14 @@ class HiddenColumn(Column):
 class Row(Schema, MutableSequence, Renderable):
     """테이블에 행을 나타내는 클래스 """
 
+    __slots__ = '_row',
+
     def __init__(self):
         self._row = []
 
+    def __iter__(self):
+        return iter(self._row)
+
     def __delitem__(self, key):
         del self._row[key]
 
@@ -244,11 +343,14 @@ class Row(Schema, MutableSequence, Renderable):
     def append(self, cell):
         """행에 cell을 붙입니다. """
         assert isinstance(cell, Cell)
-        super(Row, self).append(cell)
+        self._row.append(cell)
 
     def __html__(self):
         return self.render('row.html', row=self)
 
+    def __json__(self):
+        return [cell.__json__() for cell in self._row]
+
 
 class Pager(Schema, Renderable):
 
@@ -270,6 +372,8 @@ class Pager(Schema, Renderable):
             self.offset = 0
             self.count = 0
             self.padding = 10
+        self._pages = None
+        self._pages_key = None
 
     def from_page_number(self, number):
         return self.Page(limit=self.limit, offset=(number - 1) * self.limit,
@@ -277,6 +381,19 @@ class Pager(Schema, Renderable):
 
     @property
     def pages(self):
+        """보여줄 페이지의 목록.
+
+        ``limit``, ``offset``, ``count``, ``padding`` 이 바뀌지 않는 한
+        한 번만 계산합니다.
+
+        """
+        key = self.limit, self.offset, self.count, self.padding
+        if self._pages_key != key:
+            self._pages = self._compute_pages()
+            self._pages_key = key
+        return self._pages
+
+    def _compute_pages(self):
         page_count = int(math.ceil(self.count / float(self.limit)))
         current_page_count = (self.offset // self.limit) + 1
         pages = []
@@ -293,6 +410,39 @@ class Pager(Schema, Renderable):
             pages.append(p)
         return pages
 
+    @property
+    def _skips_pages(self):
+        pages = self.pages
+        return len(pages) >= 2 and pages[-2].number <= pages[-1].number - 1
+
+    @property
+    def prev_page(self):
+        """"이전" 링크가 가리키는 페이지."""
+        pages = self.pages
+        if self._skips_pages:
+            return self.from_page_number(pages[1].number - 1)
+        return pages[0]
+
+    @property
+    def next_page(self):
+        """"다음" 링크가 가리키는 페이지."""
+        pages = self.pages
+        if self._skips_pages:
+            return self.from_page_number(pages[-2].number + 1)
+        return pages[-1]
+
+    @property
+    def leading_ellipsis(self):
+        """첫 페이지와 두 번째로 보여줄 페이지 사이에 생략된 페이지가 있는지."""
+        pages = self.pages
+        return len(pages) >= 2 and pages[1].number - pages[0].number > 1
+
+    @property
+    def trailing_ellipsis(self):
+        """마지막 페이지 앞에 생략된 페이지가 있는지."""
+        pages = self.pages
+        return len(pages) >= 2 and pages[-1].number - pages[-2].number > 1
+
     def range(self, start, end, max_, min_=1):
         i = start
         yield min_
@@ -306,6 +456,196 @@ class Pager(Schema, Renderable):
     def __html__(self):
         return self.render('pager.html', pager=self)
 
+    def __json__(self):
+        pages = self.pages
+        return {
+            'limit': self.limit,
+            'offset': self.offset,
+            'count': self.count,
+            'pages': [dict(page._asdict()) for page in pages],
+            'previous': (None if pages[0].selected
+                         else dict(self.prev_page._asdict())),
+            'next': (None if pages[-1].selected
+                     else dict(self.next_page._asdict())),
+        }
+
+
+class SeekPager(Schema, Renderable):
+    """키셋 페이지네이션(:meth:`Table.seek`)의 이전/다음 링크.
+
+    오프셋 대신 이전 페이지의 마지막 행(또는 다음 페이지의 첫 행)의 정렬 키를
+    담은 커서를 ``cursor`` 쿼리 스트링으로 넘깁니다.
+
+    :param int limit: 한 페이지의 행의 수
+    :param str previous_cursor: 이전 페이지의 커서. 첫 페이지면 :const:`None`
+    :param str next_cursor: 다음 페이지의 커서. 마지막 페이지면 :const:`None`
+
+    """
+
+    #: 이전 페이지를 가리키는 커서의 방향
+    PREVIOUS = 'p'
+
+    #: 다음 페이지를 가리키는 커서의 방향
+    NEXT = 'n'
+
+    def __init__(self, limit, previous_cursor=None, next_cursor=None):
+        self.limit = int(limit)
+        self.previous_cursor = previous_cursor
+        self.next_cursor = next_cursor
+
+    @classmethod
+    def encode_cursor(cls, direction, values):
+        """정렬 키 값들을 URL에 넣을 수 있는 커서로 만듭니다.
+
+        :param str direction: :const:`PREVIOUS` or :const:`NEXT`
+        :param values: 정렬 키 값들. JSON으로 표현할 수 있는 값과
+                       :class:`~datetime.datetime`, :class:`~datetime.date`,
+                       :class:`~datetime.time`, :class:`~decimal.Decimal`,
+                       :class:`~uuid.UUID` 를 쓸 수 있습니다. 시간대가 있는
+                       시각은 UTC 오프셋을 함께 담습니다.
+        :rtype: :class:`str`
+
+        """
+        payload = json.dumps([direction, [_dump_key(v) for v in values]],
+                             separators=(',', ':'))
+        cursor = base64.urlsafe_b64encode(payload.encode('utf-8'))
+        return cursor.decode('ascii').rstrip('=')
+
+    @classmethod
+    def decode_cursor(cls, cursor):
+        """:meth:`encode_cursor` 로 만든 커서를 해석합니다.
+
+        :param str cursor: 커서
+        :return: ``(direction, values)``
+        :raise dodotable.exc.BadCursor: 커서를 해석할 수 없을 때
+
+        """
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            payload = base64.urlsafe_b64decode(padded.encode('ascii'))
+            payload = json.loads(payload.decode('utf-8'))
+            if not (isinstance(payload, list) and len(payload) == 2):
+                raise ValueError(payload)
+            direction, values = payload
+            if direction not in (cls.PREVIOUS, cls.NEXT) or \
+               not isinstance(values, list):
+                raise ValueError(payload)
+            return direction, [_load_key(v) for v in values]
+        except (ArithmeticError, KeyError, TypeError, ValueError,
+                UnicodeError, binascii.Error):
+            # ArithmeticError covers decimal.InvalidOperation
+            raise BadCursor('invalid cursor: ' + repr(cursor))
+
+    def __html__(self):
+        return self.render('seek_pager.html', pager=self)
+
+    def __json__(self):
+        return {
+            'limit': self.limit,
+            'previous_cursor': self.previous_cursor,
+            'next_cursor': self.next_cursor,
+        }
+
+
+class Criteria(collections.namedtuple('Criteria', 'filters orders elapsed')):
+    """:class:`Table` 의 필터와 정렬 조건을 한 번 평가한 결과.
+
+    :attr:`Table.criteria` 가 만들고 행의 수, 페이지 쿼리, 캐시 키가 함께
+    씁니다.
+
+    :param tuple filters: :const:`None` 이 아닌 필터들의 SQL 조건
+    :param tuple orders: 정렬 조건들
+    :param float elapsed: 필터와 정렬 조건을 평가하는 데 걸린 초
+
+    """
+
+    __slots__ = ()
+
+
+try:
+    _timezone = datetime.timezone
+except AttributeError:  # Python 2
+    class _timezone(datetime.tzinfo):
+
+        def __init__(self, offset):
+            self._offset = offset
+
+        def utcoffset(self, dt):
+            return self._offset
+
+        def dst(self, dt):
+            return datetime.timedelta(0)
+
+        def tzname(self, dt):
+            return None
+
+
+_utc_offset_re = re.compile(r'([+-])(\d\d):(\d\d)(?::(\d\d(?:\.\d+)?))?$')
+
+
+def _split_utc_offset(value):
+    """``isoformat()`` 이 붙인 UTC 오프셋을 떼어냅니다.
+
+    :return: ``(오프셋을 뗀 문자열, tzinfo or None)``
+
+    """
+    match = _utc_offset_re.search(value)
+    if match is None:
+        return value, None
+    sign, hours, minutes, seconds = match.groups()
+    offset = datetime.timedelta(hours=int(hours), minutes=int(minutes),
+                                seconds=float(seconds or 0))
+    if sign == '-':
+        offset = -offset
+    return value[:match.start()], _timezone(offset)
+
+
+def _parse_iso(value, formats):
+    value, tzinfo = _split_utc_offset(value)
+    for format_ in formats:
+        try:
+            parsed = datetime.datetime.strptime(value, format_)
+        except ValueError:
+            continue
+        return parsed.replace(tzinfo=tzinfo)
+    raise ValueError(value)
+
+
+def _dump_key(value):
+    if isinstance(value, datetime.datetime):
+        return {'datetime': value.isoformat()}
+    elif isinstance(value, datetime.date):
+        return {'date': value.isoformat()}
+    elif isinstance(value, datetime.time):
+        return {'time': value.isoformat()}
+    elif isinstance(value, decimal.Decimal):
+        return {'decimal': str(value)}
+    elif isinstance(value, uuid.UUID):
+        return {'uuid': value.hex}
+    return value
+
+
+def _load_key(value):
+    if value is None or isinstance(value, string_types + (numbers.Number,)):
+        return value
+    elif not (isinstance(value, dict) and len(value) == 1 and
+              isinstance(next(iter(value.values())), string_types)):
+        # e.g. a list, which would end up in the query as a tuple
+        raise ValueError(value)
+    elif 'datetime' in value:
+        return _parse_iso(value['datetime'], ('%Y-%m-%dT%H:%M:%S.%f',
+                                              '%Y-%m-%dT%H:%M:%S'))
+    elif 'date' in value:
+        return datetime.datetime.strptime(value['date'], '%Y-%m-%d').date()
+    elif 'time' in value:
+        return _parse_iso(value['time'], ('%H:%M:%S.%f', '%H:%M:%S')) \
+            .timetz()
+    elif 'decimal' in value:
+        return decimal.Decimal(value['decimal'])
+    elif 'uuid' in value:
+        return uuid.UUID(value['uuid'])
+    raise ValueError(value)
+
 
 class Table(Schema, Queryable, Renderable):
     """데이터를 나타내는 테이블의 틀
@@ -314,12 +654,79 @@ class Table(Schema, Queryable, Renderable):
     :param label:
     :param columns:
     :param sqlalchemy_session:
+    :param bool flat: 열, 행, 셀, 페이저를 각각 렌더링하지 않고
+                      ``table.html`` 한 번으로 렌더링합니다.
+                      결과 HTML은 같습니다.
+    :param counter: ``COUNT(*)`` 쿼리 대신 쓸 행의 수.
+                    필터가 적용된 :class:`~sqlalchemy.orm.query.Query` 를 받아
+                    행의 수를 돌려주는 함수를 주면 통계 테이블이나
+                    ``pg_class.reltuples`` 같은 근사값을 쓸 수 있습니다.
+    :type counter: :class:`int` or :class:`~collections.abc.Callable`
+    :param str count_strategy: :meth:`select` 가 행의 수를 세는 방법.
+                               :const:`COUNT_WINDOW` 를 주면 윈도 함수를
+                               지원하는 데이터베이스에서는 페이지와 행의 수를
+                               쿼리 한 번으로 가져옵니다.
+                               :const:`COUNT_CONCURRENT` 를 주면 페이지를
+                               가져오는 동안 다른 스레드에서 행의 수를
+                               셉니다.
+    :param bool projection: 엔티티의 모든 칼럼을 읽지 않고 보이는 열이
+                            쓰는 칼럼만 ``load_only`` 로 읽습니다.
+                            ``artist.name`` 처럼 관계를 따라가는 경로는
+                            ``selectinload`` 로 읽습니다. 나머지 칼럼은
+                            접근할 때 따로 읽어옵니다.
+    :param str eager_load: ``artist.name`` 처럼 관계를 따라가는 열을 행마다
+                           따로 읽지 않도록(N+1) 관계를 미리 읽는 방법.
+                           :const:`~dodotable.loading.LoadPlan.SELECTIN`,
+                           :const:`~dodotable.loading.LoadPlan.JOINED`,
+                           끄려면 :const:`None`
+    :param cache: 렌더링된 HTML을 캐시합니다. :meth:`select` 는 테이블의
+                  클래스와 레이블, 열들, 페이지 쿼리의 SQL 문과 바인드
+                  파라미터, 오프셋, 리밋, 로케일,
+                  :meth:`Environment.cache_key()
+                  <dodotable.environment.Environment.cache_key>` 로 키를
+                  만들고, 캐시된 HTML이 있으면 페이지 쿼리를 실행하지
+                  않습니다. 이때 :attr:`rows` 는 비어 있고, :meth:`to_dict`
+                  를 부르면 행을 가져옵니다.
+                  :meth:`iter_html` 과 :meth:`seek` 은 캐시를 쓰지 않습니다.
+    :type cache: :class:`~dodotable.cache.FragmentCache`
+    :param result_cache: :meth:`select` 가 가져온 행들을 보이는 열의 값의
+                         튜플로, 행의 수와 함께 캐시합니다. 키는 페이지
+                         쿼리의 SQL 문과 바인드 파라미터, 열들로 만듭니다.
+                         :class:`Column` 과 :class:`LinkedColumn` 의 셀만
+                         값으로 다시 만들 수 있으므로, 다른 열이 있거나
+                         셀의 값이 문자열, 숫자, 날짜 같은 단순한 값이 아니면
+                         캐시하지 않습니다.
+    :type result_cache: :class:`~dodotable.cache.ResultCache`
 
     """
 
+    #: 페이지 쿼리와 별도로 ``COUNT(*)`` 쿼리를 실행합니다.
+    COUNT_QUERY = 'query'
+
+    #: 페이지 쿼리에 ``count(*) OVER ()`` 를 붙여서 한 번에 가져옵니다.
+    #: 윈도 함수를 지원하지 않는 데이터베이스에서는 :const:`COUNT_QUERY` 처럼
+    #: 동작합니다.
+    COUNT_WINDOW = 'window'
+
+    #: 페이지 쿼리를 실행하는 동안 :meth:`Environment.create_session()
+    #: <dodotable.environment.Environment.create_session>` 이 만든 세션으로
+    #: 스레드 풀에서 ``COUNT(*)`` 쿼리를 실행합니다. 세션을 만들 수 없으면
+    #: :const:`COUNT_QUERY` 처럼 동작합니다.
+    COUNT_CONCURRENT = 'concurrent'
+
+    #: (:class:`int`) :const:`COUNT_CONCURRENT` 가 쓰는 스레드 풀의 크기
+    COUNT_WORKERS = 4
+
     def __init__(self, cls, label, unit_label="row",
                  columns=None,
-                 sqlalchemy_session=None):
+                 sqlalchemy_session=None,
+                 flat=False,
+                 counter=None,
+                 count_strategy=COUNT_QUERY,
+                 projection=False,
+                 eager_load=LoadPlan.SELECTIN,
+                 cache=None,
+                 result_cache=None):
         self.cls = cls
         self.label = label
         self.unit_label = unit_label
@@ -340,77 +747,790 @@ class Table(Schema, Queryable, Renderable):
                                  "can't be None".format(self))
         self.pager = Pager(limit=1, offset=0, count=0)
         self.pager.environment = self.environment
+        self._filter_buckets = None
+        self._criteria = None
+        self.flat = flat
+        self.counter = counter
+        if count_strategy not in (self.COUNT_QUERY, self.COUNT_WINDOW,
+                                  self.COUNT_CONCURRENT):
+            raise ValueError('unknown count_strategy: ' +
+                             repr(count_strategy))
+        self.count_strategy = count_strategy
+        self.projection = projection
+        self.eager_load = eager_load
+        self.cache = cache
+        self.result_cache = result_cache
+        self._fragment_key = None
+        self._fragment = None
+        self._result_key = None
+        self._skipped_page = None
 
     def select(self, offset=Pager.DEFAULT_OFFSET, limit=Pager.DEFAULT_LIMIT):
-        self.rows = []
+        self._count = None
         q = self.query.offset(offset).limit(limit)
-        for i, row in enumerate(q):
+        if not self._load_cached_page(q, offset, limit):
+            if self._use_window_count(q):
+                q = self._fetch_with_window_count(q)
+            count = self._submit_count()
+            rows = list(self._iter_rows(q))
+            if count is not None:
+                self._count = count.result()
+            self._store_page(rows)
+        self.pager = Pager(limit=limit, offset=offset,
+                           count=self.count)
+        self.pager.environment = self.environment
+        return self
+
+    def _submit_count(self):
+        """:const:`COUNT_CONCURRENT` 이면 스레드 풀에서 행의 수를 세기
+        시작합니다.
+
+        :return: 행의 수를 돌려줄 :class:`~concurrent.futures.Future`.
+                 동시에 셀 수 없으면 :const:`None`
+
+        """
+        if self.count_strategy != self.COUNT_CONCURRENT or \
+           self._count is not None or self.counter is not None or \
+           ThreadPoolExecutor is None:
+            return None
+        session = self.environment.create_session()
+        if session is None:
+            return None
+        query = self.build_base_query().with_session(session)
+
+        def count():
+            try:
+                return query.count()
+            finally:
+                session.close()
+        return _get_count_executor(self.COUNT_WORKERS).submit(count)
+
+    def _load_cached_page(self, query, offset, limit):
+        """:attr:`cache` 나 :attr:`result_cache` 에 페이지가 있으면
+        :attr:`rows` 와 행의 수를 채웁니다.
+
+        :return: 캐시된 페이지를 찾았는지
+        :rtype: :class:`bool`
+
+        """
+        self._fragment_key = self._fragment = self._result_key = None
+        self._skipped_page = None
+        use_result_cache = self.result_cache is not None and \
+            self._packable_columns()
+        if self.cache is None and not use_result_cache:
+            return False
+        statement = statement_key(query)
+        if self.cache is not None:
+            self._fragment_key = self._fragment_cache_key(statement,
+                                                          offset, limit)
+            self._fragment = self.cache.get(self._fragment_key)
+            if self._fragment is not None:
+                self.rows = []
+                self._count = self._fragment[1]
+                self._skipped_page = query, statement, offset, limit
+                return True
+        if use_result_cache:
+            self._result_key = self._result_cache_key(statement,
+                                                      offset, limit)
+            result = self.result_cache.get(self._result_key)
+            if result is not None:
+                packed, self._count = result
+                self.rows = list(self._unpack_rows(packed))
+                return True
+        return False
+
+    def _fetch_skipped_page(self):
+        """:attr:`cache` 에서 HTML을 찾아서 :meth:`select` 가 가져오지 않은
+        행들을 가져옵니다. :attr:`result_cache` 가 있으면 먼저 찾아봅니다."""
+        query = self._pop_skipped_page()
+        if query is not None:
+            self._store_page(list(self._iter_rows(query)))
+
+    def _pop_skipped_page(self):
+        """:meth:`select` 가 가져오지 않은 행들을 :attr:`result_cache` 에서
+        찾아봅니다.
+
+        :return: 행들을 데이터베이스에서 가져와야 하면 페이지의 쿼리,
+                 아니면 :const:`None`
+
+        """
+        if self._skipped_page is None:
+            return None
+        query, statement, offset, limit = self._skipped_page
+        self._skipped_page = None
+        if self.result_cache is not None and self._packable_columns():
+            self._result_key = self._result_cache_key(statement,
+                                                      offset, limit)
+            result = self.result_cache.get(self._result_key)
+            if result is not None:
+                self.rows = list(self._unpack_rows(result[0]))
+                return None
+        return query
+
+    def _store_page(self, rows):
+        """가져온 페이지를 :attr:`rows` 로 두고 :attr:`result_cache` 에
+        저장합니다."""
+        self.rows = rows
+        if self._result_key is not None:
+            packed = self._pack_rows(rows)
+            if packed is not None:
+                self.result_cache.set(self._result_key, (packed, self.count))
+
+    def iter_html(self, offset=Pager.DEFAULT_OFFSET,
+                  limit=Pager.DEFAULT_LIMIT, yield_per=100, buffer_size=64):
+        """:meth:`select` 와 :meth:`__html__` 을 합친 것처럼 동작하지만,
+        행을 모두 읽어두지 않고 데이터베이스에서 ``yield_per`` 개씩 가져오며
+        HTML을 조각조각 내보냅니다.
+
+        페이지 크기와 관계없이 메모리 사용량이 일정하므로 수천 행을 한 번에
+        보여줄 때 씁니다. :attr:`rows` 는 한 번만 순회할 수 있는 스트림이 되어
+        렌더링이 끝나면 비어 있습니다.
+
+        .. code-block:: python
+
+           from flask import Response, stream_with_context
+
+           @app.route('/musics/')
+           def list_musics():
+               table = Table(...)
+               return Response(stream_with_context(table.iter_html(0, 5000)))
+
+        :param int offset:
+        :param int limit:
+        :param int yield_per: 데이터베이스에서 한 번에 가져올 행의 수
+        :param int buffer_size: 한 조각으로 묶어서 내보낼 템플릿 출력의 수
+        :return: HTML 조각을 내보내는 이터레이터
+
+        """
+        self._count = None
+        self._fragment_key = self._fragment = None
+        self._skipped_page = None
+        self.pager = Pager(limit=limit, offset=offset,
+                           count=self.count)
+        self.pager.environment = self.environment
+        q = self.query.offset(offset).limit(limit).yield_per(yield_per)
+        self.rows = _RowStream(self._iter_rows(q))
+        template_name, extra_environments, context = self._render_context()
+        html = stream(template_name,
+                      extra_environments=extra_environments,
+                      **context)
+        if buffer_size:
+            html.enable_buffering(buffer_size)
+        return html
+
+    def export(self, fp, format='csv', yield_per=1000):
+        """필터와 정렬이 적용된 모든 행을 CSV나 NDJSON으로 씁니다.
+
+        :class:`Row` 와 :class:`Cell` 을 만들지 않고 ``yield_per`` 개씩 읽어서
+        바로 쓰므로 메모리 사용량이 일정합니다.
+        자세한 내용은 :func:`dodotable.export.export` 를 보세요.
+
+        :param fp: 쓸 파일 객체
+        :param str format: ``'csv'`` or ``'ndjson'``
+        :param int yield_per: 데이터베이스에서 한 번에 가져올 행의 수
+        :return: 쓴 행의 수
+        :rtype: :class:`int`
+
+        """
+        from .export import export
+        return export(self, fp, format=format, yield_per=yield_per)
+
+    def seek(self, cursor=None, limit=Pager.DEFAULT_LIMIT):
+        """오프셋 대신 키셋(seek) 방식으로 페이지를 가져옵니다.
+
+        현재 정렬 조건에 기본 키를 더한 값을 커서로 써서
+        ``WHERE (sort_key, pk) > (:last, :last_pk)`` 처럼 이어지는 행을
+        가져오므로, 페이지가 아무리 뒤에 있어도 인덱스를 타고 빠르게
+        가져올 수 있습니다. :attr:`pager` 는 이전/다음 커서 링크만 있는
+        :class:`SeekPager` 가 됩니다.
+
+        ``NULL`` 이 될 수 있는 정렬 키는 데이터베이스와 상관없이 ``NULL`` 을
+        가장 큰 값으로 정렬합니다. 그래서 :meth:`select` 와 ``NULL`` 의 위치가
+        다를 수 있습니다.
+
+        :param str cursor: :attr:`SeekPager.previous_cursor` 나
+                           :attr:`SeekPager.next_cursor` 의 값.
+                           생략하면 첫 페이지를 가져옵니다.
+        :param int limit: 한 페이지의 행의 수
+        :return: 자기 자신
+        :raise dodotable.exc.BadCursor: 커서를 해석할 수 없을 때
+
+        """
+        self._count = None
+        self._fragment_key = self._fragment = None
+        self._skipped_page = None
+        limit = int(limit)
+        keys = self._seek_keys()
+        query = self.build_base_query()
+        forward = True
+        if cursor:
+            direction, values = SeekPager.decode_cursor(cursor)
+            if len(values) != len(keys):
+                raise BadCursor('invalid cursor: ' + repr(cursor))
+            forward = direction == SeekPager.NEXT
+            query = query.filter(_seek_criterion(keys, values, forward))
+        query = query.order_by(*[
+            order
+            for key, ascending, _ in keys
+            for order in _seek_order(key, ascending == forward)
+        ])
+        results = query.limit(limit + 1).all()
+        has_more = len(results) > limit
+        results = results[:limit]
+        if not forward:
+            results.reverse()
+        previous_cursor = next_cursor = None
+        if results:
+            first = [get_key(results[0]) for _, _, get_key in keys]
+            last = [get_key(results[-1]) for _, _, get_key in keys]
+            if cursor and (forward or has_more):
+                previous_cursor = SeekPager.encode_cursor(SeekPager.PREVIOUS,
+                                                          first)
+            if has_more or not forward:
+                next_cursor = SeekPager.encode_cursor(SeekPager.NEXT, last)
+        self.rows = list(self._iter_rows(results))
+        self.pager = SeekPager(limit=limit, previous_cursor=previous_cursor,
+                               next_cursor=next_cursor)
+        self.pager.environment = self.environment
+        return self
+
+    def _seek_keys(self):
+        """키셋 페이지네이션에 쓸 ``(표현식, 오름차순 여부, 값을 가져올 함수)``
+        들을 정렬 순서대로 가져옵니다. 기본 키가 마지막에 붙습니다."""
+        from .condition import Order
+        keys = []
+        for order in self._orders:
+            keys.append((
+                order.attribute,
+                order.order == Order.ASCENDANT,
+                data_getter(order.attribute_name),
+            ))
+        if isinstance(self.cls, Query):
+            entity = self.cls.column_descriptions[0]['entity']
+        else:
+            entity = self.cls
+        mapper = inspect(entity)
+        for column in mapper.primary_key:
+            key = mapper.get_property_by_column(column).key
+            attribute = getattr(entity, key)
+            if not any(attribute is k for k, _, _ in keys):
+                keys.append((attribute, True, data_getter(key)))
+        return keys
+
+    def _fragment_cache_key(self, statement, offset, limit):
+        """:attr:`cache` 에 렌더링된 HTML을 저장할 키를 만듭니다."""
+        get_locale = self.environment.get_locale
+        locale = get_locale() if get_locale is not None else None
+        parts = (
+            '{0.__module__}.{0.__name__}'.format(type(self)),
+            self.label,
+            self.unit_label,
+            self.flat,
+            tuple((type(column).__name__, column.attr, column.label)
+                  for column in self.columns),
+            statement,
+            offset,
+            limit,
+            None if locale is None else text_type(locale),
+            self.environment.cache_key(),
+        )
+        return self.cache.key(parts, self._cached_entities())
+
+    def _result_cache_key(self, statement, offset, limit):
+        """:attr:`result_cache` 에 페이지를 저장할 키를 만듭니다."""
+        parts = (
+            tuple((type(column).__name__, column.attr)
+                  for column in self.columns),
+            statement,
+            offset,
+            limit,
+        )
+        return self.result_cache.key(parts, self._cached_entities())
+
+    def _cached_entities(self):
+        """캐시를 무효화할 때 볼 엔티티들."""
+        if isinstance(self.cls, Query):
+            entity = self.cls.column_descriptions[0]['entity']
+        else:
+            entity = self.cls
+        paths = [path for column in self.columns
+                 for path in column._load_paths()]
+        return related_entities(entity, paths)
+
+    def _packable_columns(self):
+        """보이는 열들의 셀을 모두 값만으로 다시 만들 수 있는지."""
+        return all(get_unbound_function(type(column).__cell__) in PLAIN_CELLS
+                   for column in self.columns)
+
+    def _pack_rows(self, rows):
+        """:class:`Row` 들을 보이는 열의 값의 튜플들로 바꿉니다.
+
+        :class:`LinkedCell` 은 ``(값, URL)`` 로 바꿉니다. 단순한 값이 아닌
+        셀이 있으면 :const:`None` 을 돌려줍니다.
+
+        """
+        packed = []
+        for row in rows:
+            values = []
+            for cell in row:
+                if not isinstance(cell.data, PLAIN_TYPES):
+                    return None
+                if isinstance(cell, LinkedCell):
+                    values.append((cell.data, cell.url))
+                else:
+                    values.append(cell.data)
+            packed.append(tuple(values))
+        return tuple(packed)
+
+    def _unpack_rows(self, packed):
+        """:meth:`_pack_rows` 로 바꾼 값들을 다시 :class:`Row` 로 만듭니다."""
+        columns = self.columns
+        for i, values in enumerate(packed):
+            _row = Row()
+            for j, (column, value) in enumerate(zip(columns, values)):
+                if isinstance(column, LinkedColumn):
+                    data, url = value
+                    _row.append(LinkedCell(col=j, row=i, data=data,
+                                           endpoint=url))
+                else:
+                    _row.append(Cell(col=j, row=i, data=value,
+                                     _repr=column._repr,
+                                     classes=column.classes))
+            yield _row
+
+    def _use_window_count(self, query):
+        if self.count_strategy != self.COUNT_WINDOW or \
+           self.counter is not None or \
+           len(query.column_descriptions) != 1 or \
+           not _window_countable(query):
+            return False
+        try:
+            bind = self._get_bind(query)
+        except UnboundExecutionError:
+            return False
+        return supports_window_functions(bind.dialect)
+
+    def _get_bind(self, query):
+        """``query`` 를 실행할 엔진을 가져옵니다."""
+        return query.session.get_bind()
+
+    def _fetch_with_window_count(self, query):
+        """``count(*) OVER ()`` 를 붙인 쿼리로 페이지와 행의 수를 함께
+        가져옵니다.
+
+        페이지가 비어있으면 행의 수를 알 수 없으므로 :attr:`count` 가 따로
+        셉니다.
+
+        """
+        total = func.count().over().label('dodotable_count')
+        results = query.add_columns(total).all()
+        if results:
+            self._count = int(results[0][-1])
+        return [result[0] for result in results]
+
+    def _iter_rows(self, query):
+        """쿼리 결과를 하나씩 :class:`Row` 로 변환합니다."""
+        columns = self.columns
+        for i, row in enumerate(query):
             _row = Row()
-            for j, col in enumerate(self.columns):
+            for j, col in enumerate(columns):
                 _row.append(
                     col.__cell__(col=j, row=i, data=row,
                                  attribute_name=col.attr)
                 )
-            self.rows.append(_row)
-        self.pager = Pager(limit=limit, offset=offset,
-                           count=self.count)
-        self.pager.environment = self.environment
-        return self
+            yield _row
 
     def add_filter(self, filter):
         self._filters.append(filter)
+        self._count = None
+        self._fragment_key = self._fragment = None
+        self._skipped_page = None
+        self._filter_buckets = None
+        self._criteria = None
+
+    def _bucket_filters(self):
+        if self._filter_buckets is None:
+            from .helper import Category, Limit, _Helper
+            buckets = [], [], []
+            categories, renderable_filters, limits = buckets
+            for filter in self._filters:
+                if not isinstance(filter, Renderable):
+                    continue
+                if isinstance(filter, Category):
+                    categories.append(filter)
+                if isinstance(filter, Limit):
+                    limits.append(filter)
+                if not isinstance(filter, _Helper):
+                    renderable_filters.append(filter)
+            self._filter_buckets = buckets
+        return self._filter_buckets
 
     @property
-    def _order_queries(self):
-        """쿼리의 정렬 조건을 가져옵니다."""
+    def categories(self):
+        """(:class:`list`) 제목 옆에 렌더링할
+        :class:`~dodotable.helper.Category` 필터들"""
+        return self._bucket_filters()[0]
+
+    @property
+    def renderable_filters(self):
+        """(:class:`list`) 헬퍼가 아닌 렌더링 가능한 필터들"""
+        return self._bucket_filters()[1]
+
+    @property
+    def limits(self):
+        """(:class:`list`) 테이블 아래에 렌더링할
+        :class:`~dodotable.helper.Limit` 헬퍼들"""
+        return self._bucket_filters()[2]
+
+    @property
+    def _orders(self):
+        """정렬 조건인 :class:`~dodotable.condition.Order` 들을 가져옵니다."""
         from .condition import Order
         order = []
         for column in self.columns:
             if column.order_by:
-                o = Order(self.cls, column.attr, column.order_by)
-                order.append(o.__query__())
+                order.append(Order(self.cls, column.attr, column.order_by))
         if not order:
             k = self.columns[0].attr
             o = Order(self.cls, k)
             self.columns[0].order_by = o.order
-            order.append(o.__query__())
+            order.append(o)
         return order
 
+    @property
+    def _order_queries(self):
+        """쿼리의 정렬 조건을 가져옵니다."""
+        return [o.__query__() for o in self._orders]
+
     @property
     def _filter_queries(self):
         for filter in self._filters:
             if filter:
                 yield filter.__query__()
 
+    @property
+    def criteria(self):
+        """(:class:`Criteria`) 필터와 정렬 조건.
+
+        필터들의 :meth:`~Queryable.__query__` 는 처음 쓸 때 한 번만 부르고,
+        :meth:`add_filter` 전까지 행의 수와 페이지 쿼리가 재사용합니다.
+        테이블은 요청마다 만든다고 가정하므로 필터가 읽는 ``request_args`` 를
+        나중에 바꿔도 반영되지 않습니다.
+        :attr:`Criteria.elapsed` 로 평가에 걸린 시간을 알 수 있습니다.
+
+        """
+        if self._criteria is None:
+            start = timeit.default_timer()
+            filters = tuple(filter for filter in self._filter_queries
+                            if filter is not None)
+            orders = tuple(self._order_queries)
+            self._criteria = Criteria(filters, orders,
+                                      timeit.default_timer() - start)
+        return self._criteria
+
     @property
     def count(self):
-        return self.build_base_query().count()
+        """필터가 적용된 행의 수.
+
+        한 번 센 값은 다음 :meth:`select` 나 :meth:`add_filter` 전까지
+        재사용하므로 ``COUNT(*)`` 쿼리는 렌더링마다 한 번만 실행됩니다.
+
+        """
+        if self._count is None:
+            if self.counter is None:
+                count = self.build_base_query().count()
+            elif callable(self.counter):
+                count = self.counter(self.build_base_query())
+            else:
+                count = self.counter
+            self._count = int(count)
+        return self._count
 
     def build_base_query(self):
         if isinstance(self.cls, Query):
             query = self.cls
         else:
-            query = self.session.query(self.cls)
-        for filter in self._filter_queries:
-            if filter is not None:
-                query = query.filter(filter)
+            query = self._entity_query()
+        for filter in self.criteria.filters:
+            query = query.filter(filter)
         return query
 
+    def _entity_query(self):
+        """필터를 붙이기 전의 엔티티 쿼리를 만듭니다."""
+        return self.session.query(self.cls)
+
     @property
     def query(self):
         """쿼리를 만듭니다.
 
         :return:
         """
-        query = self.build_base_query().order_by(*self._order_queries)
+        query = self.build_base_query().order_by(*self.criteria.orders)
+        options = self._load_options
+        if options:
+            query = query.options(*options)
         return query
 
+    @property
+    def _load_options(self):
+        """보이는 열들이 읽는 attribute 에 맞춘 로더 옵션들."""
+        if isinstance(self.cls, Query) or \
+           not (self.projection or self.eager_load):
+            return []
+        plan = LoadPlan(self.cls)
+        for column in self.columns:
+            for path in column._load_paths():
+                plan.add(path)
+        return plan.options(projection=self.projection,
+                            strategy=self.eager_load or LoadPlan.SELECTIN)
+
     @property
     def columns(self):
         return [column for column in self._columns if column.visible]
 
     def __html__(self):
-        return self.render('table.html', table=self)
+        if self._fragment is not None:
+            return self._fragment[0]
+        template_name, extra_environments, context = self._render_context()
+        html = render(template_name,
+                      extra_environments=extra_environments,
+                      **context)
+        if self._fragment_key is not None:
+            self._fragment = html, self.count
+            self.cache.set(self._fragment_key, self._fragment)
+        return html
+
+    def to_dict(self):
+        """:meth:`select` 로 가져온 데이터를 jinja 를 거치지 않고 JSON으로
+        바꿀 수 있는 :class:`dict` 로 만듭니다.
+
+        열, 행(``_repr`` 을 거친 셀의 값), 페이저, 필터의 상태를 담습니다.
+        :meth:`~Renderable.__json__` 을 구현하지 않은 필터는 빠집니다.
+        :meth:`select` 가 :attr:`cache` 에서 HTML을 찾아서 행을 가져오지
+        않았다면 이때 가져옵니다.
+
+        :return: JSON으로 바꿀 수 있는 :class:`dict`
+        :rtype: :class:`dict`
+
+        """
+        self._fetch_skipped_page()
+        filters = []
+        for filter in self._filters:
+            to_json = getattr(filter, '__json__', None)
+            if to_json is None:
+                continue
+            try:
+                filters.append(to_json())
+            except NotImplementedError:
+                continue
+        return {
+            'label': text_type(self.label),
+            'unit_label': text_type(self.unit_label),
+            'count': self.count,
+            'columns': [column.__json__() for column in self.columns],
+            'rows': [row.__json__() for row in self.rows],
+            'pager': self.pager.__json__(),
+            'filters': filters,
+        }
+
+    __json__ = to_dict
+
+    def to_json(self):
+        """:meth:`to_dict` 를 JSON 문자열로 바꿉니다.
+
+        orjson_ 이 설치되어 있으면 씁니다.
+
+        .. _orjson: https://github.com/ijl/orjson
+
+        :return: JSON 문자열
+        :rtype: :class:`str`
+
+        """
+        return json_dumps(self.to_dict())
+
+    def _render_context(self):
+        """테이블을 렌더링할 템플릿 이름, 환경, 템플릿 변수를 가져옵니다.
+
+        :attr:`flat` 모드에서는 ``table.html`` 에 ``inline`` 함수를 넘겨서
+        테이블 전체를 한 번에 렌더링합니다. 기본
+        :meth:`~Renderable.__html__` 을 그대로 쓰는 열, 행, 셀, 페이저는 각자
+        :meth:`~Schema.render` 를 거치지 않고 ``{% include %}`` 로 같은
+        템플릿 안에서 렌더링됩니다.
+        :meth:`~Renderable.__html__` 을 재정의했거나 다른 환경을 쓰는 객체는
+        원래대로 렌더링합니다.
+
+        """
+        extra_environments = self.environment.template_globals
+        if not self.flat:
+            return 'table.html', extra_environments, {'table': self}
+        templates = {}
+
+        def inline(renderable):
+            if getattr(renderable, 'environment', None) is \
+               not self.environment:
+                return None
+            html = get_unbound_function(type(renderable).__html__)
+            template_name = INLINE_TEMPLATES.get(html)
+            if template_name is None:
+                return None
+            try:
+                return templates[template_name]
+            except KeyError:
+                template = get_template(template_name, extra_environments)
+                templates[template_name] = template
+                return template
+
+        return 'table.html', extra_environments, {
+            'table': self,
+            'inline': inline,
+        }
 
     def __query__(self):
         return self.query
+
+
+def _window_countable(query):
+    """``count(*) OVER ()`` 로 ``query`` 의 행의 수를 셀 수 있는지
+    확인합니다.
+
+    윈도 함수는 ``DISTINCT`` 보다 먼저, ``GROUP BY`` 보다 나중에 계산되므로
+    이런 쿼리나 ``UNION`` 같은 집합 연산을 감싼 쿼리에서는 실제 결과의
+    행의 수와 다를 수 있습니다.
+
+    """
+    if getattr(query, '_distinct', False) or \
+       getattr(query, '_group_by_clauses', None) or \
+       getattr(query, '_group_by', None):
+        return False
+    for from_ in getattr(query, '_from_obj', ()):
+        if isinstance(getattr(from_, 'element', None), CompoundSelect):
+            return False
+    return True
+
+
+_count_executor = None
+_count_executor_lock = threading.Lock()
+
+
+def _get_count_executor(max_workers):
+    """:const:`Table.COUNT_CONCURRENT` 가 쓰는 스레드 풀을 가져옵니다."""
+    global _count_executor
+    if _count_executor is None:
+        with _count_executor_lock:
+            if _count_executor is None:
+                _count_executor = ThreadPoolExecutor(max_workers=max_workers)
+    return _count_executor
+
+
+def _seek_criterion(keys, values, forward):
+    """``keys`` 의 순서에서 ``values`` 다음(``forward`` 가 아니면 이전)에
+    오는 행의 조건을 만듭니다.
+
+    정렬 방향이 섞여있을 수 있으므로 행 값 비교 대신
+    ``a > :a OR (a = :a AND b > :b) ...`` 로 풀어서 씁니다.
+    :const:`None` 이 될 수 있는 키는 :func:`_seek_order` 처럼
+    ``NULL`` 을 가장 큰 값으로 봅니다.
+
+    """
+    criteria = []
+    for i, (key, ascending, _) in enumerate(keys):
+        criterion = _seek_beyond(key, values[i], ascending == forward)
+        if criterion is None:
+            continue
+        equals = [_seek_equals(k, v)
+                  for (k, _, _), v in zip(keys[:i], values[:i])]
+        criteria.append(and_(*(equals + [criterion])))
+    if not criteria:
+        return false()
+    return or_(*criteria)
+
+
+def _seek_beyond(key, value, greater):
+    if value is None:
+        # NULL is the greatest value: nothing is greater than it
+        return None if greater else key.isnot(None)
+    if greater:
+        if _nullable(key):
+            return or_(key > value, key.is_(None))
+        return key > value
+    return key < value
+
+
+def _seek_equals(key, value):
+    if value is None:
+        return key.is_(None)
+    return key == value
+
+
+def _seek_order(key, ascending):
+    """:meth:`Table.seek` 의 정렬 조건. 데이터베이스마다 ``NULL`` 의 정렬
+    위치가 다르고 ``NULLS LAST`` 를 지원하지 않는 데이터베이스도 있으므로,
+    :const:`None` 이 될 수 있는 키는 ``key IS NULL`` 로 먼저 정렬해서
+    어디서나 ``NULL`` 이 가장 큰 값이 되게 합니다."""
+    if not _nullable(key):
+        return [asc(key) if ascending else desc(key)]
+    if ascending:
+        return [asc(key.is_(None)), asc(key)]
+    return [desc(key.is_(None)), desc(key)]
+
+
+def _nullable(key):
+    try:
+        columns = key.property.columns
+    except AttributeError:
+        return True
+    return any(getattr(column, 'nullable', True) for column in columns)
+
+
+class _RowStream(object):
+    """한 번만 순회할 수 있는 :class:`Row` 의 스트림.
+
+    템플릿이 ``{% if table.rows %}`` 로 비어 있는지 확인할 수 있도록 첫 행만
+    미리 읽어둡니다.
+
+    """
+
+    def __init__(self, rows):
+        self._rows = iter(rows)
+        self._head = []
+
+    def _peek(self):
+        if not self._head:
+            for row in self._rows:
+                self._head.append(row)
+                break
+        return self._head
+
+    def __bool__(self):
+        return bool(self._peek())
+
+    __nonzero__ = __bool__
+
+    def __iter__(self):
+        while self._peek():
+            yield self._head.pop()
+
+
+#: (:class:`tuple`) :attr:`Table.result_cache` 가 값만 저장해두고 셀을 다시
+#: 만들 수 있는 :meth:`Column.__cell__` 구현
+PLAIN_CELLS = (
+    get_unbound_function(Column.__cell__),
+    get_unbound_function(LinkedColumn.__cell__),
+)
+
+#: (:class:`tuple`) :attr:`Table.result_cache` 가 저장할 수 있는 셀 값의 타입
+PLAIN_TYPES = string_types + (
+    binary_type, numbers.Number, datetime.date, datetime.time,
+    datetime.timedelta, type(None),
+)
+
+
+#: (:class:`dict`) :attr:`Table.flat` 모드에서 ``{% include %}`` 로 대신할
+#: :meth:`~Renderable.__html__` 구현과 템플릿
+INLINE_TEMPLATES = {
+    get_unbound_function(Cell.__html__): 'cell.html',
+    get_unbound_function(LinkedCell.__html__): 'linkedcell.html',
+    get_unbound_function(Column.__html__): 'column.html',
+    get_unbound_function(Row.__html__): 'row.html',
+    get_unbound_function(Pager.__html__): 'pager.html',
+}
@@ -0,0 +1,390 @@
+# -*- coding: utf-8 -*-
+""":mod:`dodotable.search` --- search strategies
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+:class:`~dodotable.condition.Ilike` 가 검색어로 만드는 조건을 바꿉니다.
+기본값인 :class:`Contains` 는 ``ILIKE '%word%'`` 라서 B-tree 인덱스를 쓸 수
+없고 검색할 때마다 테이블 전체를 읽습니다. 큰 테이블에서는 인덱스를 쓸 수
+있는 방법을 열마다 고를 수 있습니다.
+
+.. code-block:: python
+
+   from dodotable.condition import Ilike, IlikeSet
+   from dodotable.search import FullText, Prefix
+
+   table = Table(cls=Music, columns=[
+       Column(attr='name', label=u'이름', filters=[
+           Ilike(Music, 'name', request_args, strategy=Prefix()),
+       ]),
+       Column(attr='lyrics', label=u'가사', filters=[
+           Ilike(Music, 'lyrics', request_args,
+                 strategy=FullText(config='english')),
+       ]),
+   ], ...)
+   table.add_filter(IlikeSet(table, request_args))
+
+자주 나열하는 작은 참조 테이블(태그, 분류, 나라 등)은 :class:`SearchIndex` 로
+메모리에서 검색할 수 있습니다.
+
+"""
+import threading
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.expression import column, false, func, select, table
+
+
+__all__ = (
+    'Contains', 'Fts5', 'FullText', 'Prefix', 'SearchIndex',
+    'SearchStrategy', 'Trigram',
+)
+
+
+class SearchStrategy(object):
+    """검색어로 조건을 만드는 방법의 인터페이스."""
+
+    def criterion(self, attribute, word):
+        """``attribute`` 에서 ``word`` 를 찾는 조건을 만듭니다.
+
+        :param attribute: 검색할 attribute 나 칼럼
+        :param str word: 검색어
+        :return: SQL 조건. 조건을 걸지 않으려면 :const:`None`
+
+        """
+        raise NotImplementedError('criterion not implemented yet.')
+
+
+class Contains(SearchStrategy):
+    """``ILIKE '%word%'`` 로 검색어가 들어있는 행을 찾습니다.
+
+    :class:`Prefix` 처럼 검색어의 ``%``, ``_``, ``\\`` 는 이스케이프하므로
+    검색어를 글자 그대로 찾습니다.
+
+    인덱스를 쓸 수 없지만 어느 데이터베이스에서나 동작합니다.
+    PostgreSQL에서는 ``pg_trgm`` 의 ``gin_trgm_ops`` 인덱스가 있으면 이 조건도
+    인덱스를 탑니다.
+
+    """
+
+    def criterion(self, attribute, word):
+        return attribute.ilike(u'%' + _escape_like(word) + u'%',
+                               escape='\\')
+
+
+class Prefix(SearchStrategy):
+    """검색어로 시작하는 행을 ``LIKE 'word%'`` 로 찾습니다.
+
+    검색어의 ``%``, ``_``, ``\\`` 는 와일드카드로 쓰이지 않도록
+    이스케이프합니다. 대소문자를 구분하지 않을 때는 ``ILIKE`` 대신
+    ``lower(칼럼) LIKE 'word%'`` 를 씁니다.
+
+    - PostgreSQL: ``case_sensitive`` 이면 칼럼의 ``text_pattern_ops`` B-tree
+      인덱스를, 아니면 ``lower(칼럼)`` 에 대한 ``text_pattern_ops`` 인덱스를
+      씁니다.
+    - SQLite: ``LIKE`` 가 ASCII 대소문자를 구분하지 않으므로
+      ``case_sensitive=True`` 로 ``LIKE`` 를 써야 ``COLLATE NOCASE``
+      인덱스를 씁니다.
+
+    :param bool case_sensitive: ``lower()`` 를 씌우지 않고 칼럼에 바로
+                                ``LIKE`` 를 씁니다.
+
+    """
+
+    def __init__(self, case_sensitive=False):
+        self.case_sensitive = case_sensitive
+
+    def criterion(self, attribute, word):
+        if not word:
+            return None
+        if not self.case_sensitive:
+            attribute = func.lower(attribute)
+            word = word.lower()
+        return attribute.like(_escape_like(word) + u'%', escape='\\')
+
+
+def _escape_like(word):
+    """``word`` 의 ``LIKE`` 와일드카드를 ``\\`` 로 이스케이프합니다."""
+    return word.replace('\\', '\\\\').replace('%', '\\%') \
+               .replace('_', '\\_')
+
+
+class FullText(SearchStrategy):
+    """PostgreSQL의 전문 검색(``tsvector @@ tsquery``)으로 찾습니다.
+
+    ``to_tsvector(config, 칼럼)`` 에 대한 GIN 인덱스나 미리 계산해둔
+    ``tsvector`` 칼럼의 인덱스를 씁니다.
+
+    :param str config: 텍스트 검색 설정(``regconfig``)
+    :param vector: 검색할 ``tsvector`` 칼럼. 생략하면 검색할 attribute 에
+                   ``to_tsvector`` 를 씁니다.
+
+    """
+
+    def __init__(self, config='simple', vector=None):
+        self.config = config
+        self.vector = vector
+
+    def criterion(self, attribute, word):
+        if not word:
+            return None
+        vector = self.vector
+        if vector is None:
+            vector = func.to_tsvector(self.config, attribute)
+        return vector.op('@@')(func.plainto_tsquery(self.config, word))
+
+
+class Trigram(SearchStrategy):
+    """PostgreSQL ``pg_trgm`` 의 유사도 연산자(``%``)로 비슷한 행을 찾습니다.
+
+    ``gin_trgm_ops`` 나 ``gist_trgm_ops`` 인덱스를 씁니다. 유사도의 기준은
+    ``pg_trgm.similarity_threshold`` 설정을 따릅니다.
+
+    :param bool word_similarity: 칼럼 전체가 아니라 칼럼 안의 가장 비슷한
+                                 부분과 비교합니다(``%>``).
+
+    """
+
+    def __init__(self, word_similarity=False):
+        self.word_similarity = word_similarity
+
+    def criterion(self, attribute, word):
+        if not word:
+            return None
+        return attribute.op('%>' if self.word_similarity else '%')(word)
+
+
+class Fts5(SearchStrategy):
+    """SQLite FTS5 가상 테이블로 찾습니다.
+
+    엔티티의 테이블을 ``content`` 로, 기본 키를 ``content_rowid`` 로 하는
+    외부 콘텐트 FTS5 테이블이 있어야 합니다. 검색어로 시작하는 토큰이 있는
+    행을 찾습니다. 매핑된 attribute 에만 쓸 수 있으므로
+    :class:`~dodotable.condition.IlikeAlias` 에는 쓸 수 없습니다.
+
+    .. code-block:: sql
+
+       CREATE VIRTUAL TABLE music_fts
+       USING fts5(name, content='music', content_rowid='id');
+
+    :param str table_name: FTS5 테이블의 이름
+    :param str column_name: 검색할 FTS5 칼럼의 이름.
+                            생략하면 attribute 의 칼럼 이름을 씁니다.
+
+    """
+
+    def __init__(self, table_name, column_name=None):
+        self.table_name = table_name
+        self.column_name = column_name
+
+    def criterion(self, attribute, word):
+        if not word:
+            return None
+        column_name = self.column_name or attribute.key
+        fts = table(self.table_name, column('rowid'), column(column_name))
+        phrase = u'"{0}"*'.format(word.replace(u'"', u'""'))
+        matches = select([fts.c.rowid]).where(
+            fts.c[column_name].match(phrase)
+        )
+        entity = attribute.class_
+        mapper = inspect(entity)
+        primary_key, = mapper.primary_key
+        key = mapper.get_property_by_column(primary_key).key
+        return getattr(entity, key).in_(matches)
+
+
+class SearchIndex(SearchStrategy):
+    """엔티티의 문자열 칼럼들을 메모리에 올려두고 검색하는 역색인.
+
+    칼럼 값을 소문자로 바꾼 뒤 트라이그램마다 기본 키의 집합을 만들어 둡니다.
+    검색어의 트라이그램이 모두 들어있는 행만 골라서 검색어가 들어있는지
+    확인하므로 :class:`Contains` 와 같은 행을 찾으면서도 데이터베이스에서
+    테이블 전체를 읽지 않습니다. 찾은 기본 키로 ``pk IN (...)`` 조건을
+    만들므로 데이터베이스는 기본 키 인덱스로 페이지만 읽습니다.
+
+    :meth:`listen` 하면 세션이 플러시할 때(``after_flush``) 바뀐 엔티티를
+    모아두었다가 커밋할 때 색인에 반영하고, 롤백하면 버립니다.
+    벌크 UPDATE/DELETE 처럼 ORM 을 거치지 않은 변경은 알 수 없으므로
+    :meth:`build` 로 다시 만들어야 합니다.
+
+    .. code-block:: python
+
+       index = SearchIndex(Tag, ['name', 'description'])
+       index.build(session)
+       index.listen()
+
+       table = Table(cls=Tag, columns=[
+           Column(attr='name', label=u'이름', filters=[
+               Ilike(Tag, 'name', request_args),
+           ]),
+       ], ...)
+       table.add_filter(IlikeSet(table, request_args, index=index))
+
+    :param cls: 색인할 엔티티
+    :param attribute_names: 색인할 문자열 attribute 들의 이름
+    :type attribute_names: :class:`~collections.abc.Sequence`
+
+    """
+
+    #: (:class:`int`) 색인하는 n-gram 의 길이
+    GRAM = 3
+
+    def __init__(self, cls, attribute_names):
+        self.cls = cls
+        self.attribute_names = tuple(attribute_names)
+        mapper = inspect(cls)
+        primary_key, = mapper.primary_key
+        self.primary_key = getattr(
+            cls, mapper.get_property_by_column(primary_key).key
+        )
+        self._lock = threading.Lock()
+        self._values = dict((name, {}) for name in self.attribute_names)
+        self._postings = dict((name, {}) for name in self.attribute_names)
+        self._targets = []
+
+    @classmethod
+    def _grams(cls, text):
+        return set(text[i:i + cls.GRAM]
+                   for i in range(len(text) - cls.GRAM + 1))
+
+    def build(self, session):
+        """``session`` 으로 엔티티를 모두 읽어서 색인을 새로 만듭니다.
+
+        :param session: 엔티티를 읽을 세션
+        :type session: :class:`~sqlalchemy.orm.session.Session`
+        :return: 색인 자신
+        :rtype: :class:`SearchIndex`
+
+        """
+        attributes = [getattr(self.cls, name)
+                      for name in self.attribute_names]
+        rows = session.query(self.primary_key, *attributes)
+        with self._lock:
+            for name in self.attribute_names:
+                self._values[name] = {}
+                self._postings[name] = {}
+            for row in rows:
+                self._update(row[0], dict(zip(self.attribute_names, row[1:])))
+        return self
+
+    def _update(self, pk, values):
+        """``pk`` 행의 색인을 ``values`` 로 바꿉니다. ``values`` 가
+        :const:`None` 이면 행을 지웁니다. 잠금을 잡은 채로 불러야 합니다."""
+        for name in self.attribute_names:
+            store = self._values[name]
+            postings = self._postings[name]
+            old = store.pop(pk, None)
+            if old is not None:
+                for gram in self._grams(old):
+                    pks = postings.get(gram)
+                    if pks is not None:
+                        pks.discard(pk)
+                        if not pks:
+                            del postings[gram]
+            value = None if values is None else values.get(name)
+            if value is None:
+                continue
+            text = u'{0}'.format(value).lower()
+            store[pk] = text
+            for gram in self._grams(text):
+                postings.setdefault(gram, set()).add(pk)
+
+    def search(self, attribute_name, word):
+        """``attribute_name`` 에 ``word`` 가 들어있는 행을 찾습니다.
+        대소문자는 구분하지 않습니다.
+
+        :param str attribute_name: 검색할 attribute 의 이름
+        :param str word: 검색어
+        :return: 찾은 행들의 기본 키
+        :rtype: :class:`set`
+
+        """
+        word = word.lower()
+        with self._lock:
+            store = self._values[attribute_name]
+            grams = self._grams(word)
+            if grams:
+                postings = self._postings[attribute_name]
+                candidates = None
+                for gram in sorted(grams,
+                                   key=lambda g: len(postings.get(g, ()))):
+                    pks = postings.get(gram)
+                    if not pks:
+                        return set()
+                    if candidates is None:
+                        candidates = set(pks)
+                    else:
+                        candidates &= pks
+                    if not candidates:
+                        return set()
+            else:
+                candidates = store
+            return set(pk for pk in candidates if word in store[pk])
+
+    def covers(self, attribute):
+        """``attribute`` 가 이 색인으로 검색할 수 있는 attribute 인지
+        확인합니다."""
+        return getattr(attribute, 'class_', None) is self.cls and \
+            attribute.key in self.attribute_names
+
+    def criterion(self, attribute, word):
+        if not word or not self.covers(attribute):
+            return Contains().criterion(attribute, word)
+        pks = self.search(attribute.key, word)
+        if not pks:
+            return false()
+        return self.primary_key.in_(sorted(pks))
+
+    def listen(self, target=Session):
+        """``target`` 의 세션들이 바꾼 엔티티를 색인에 반영합니다.
+
+        :param target: 지켜볼 세션, 세션 클래스나 :func:`sessionmaker`.
+                       생략하면 모든 세션을 지켜봅니다.
+
+        """
+        for name, listener in self._listeners():
+            event.listen(target, name, listener)
+        self._targets.append(target)
+
+    def close(self):
+        """:meth:`listen` 으로 등록한 이벤트 리스너들을 뗍니다."""
+        for target in self._targets:
+            for name, listener in self._listeners():
+                event.remove(target, name, listener)
+        self._targets = []
+
+    def _listeners(self):
+        return [
+            ('after_flush', self._after_flush),
+            ('after_commit', self._after_commit),
+            ('after_soft_rollback', self._after_soft_rollback),
+        ]
+
+    @property
+    def _pending_key(self):
+        return ('dodotable.search_index', id(self))
+
+    def _after_flush(self, session, flush_context):
+        # new, dirty and deleted still hold the pre-flush state here, and
+        # primary keys of new objects are already fetched.
+        pending = session.info.setdefault(self._pending_key, {})
+        mapper = inspect(self.cls)
+        for instance in session.new | session.dirty:
+            if isinstance(instance, self.cls):
+                pk, = mapper.primary_key_from_instance(instance)
+                pending[pk] = dict((name, getattr(instance, name))
+                                   for name in self.attribute_names)
+        for instance in session.deleted:
+            if isinstance(instance, self.cls):
+                pk, = mapper.primary_key_from_instance(instance)
+                pending[pk] = None
+
+    def _after_commit(self, session):
+        pending = session.info.pop(self._pending_key, None)
+        if pending:
+            with self._lock:
+                for pk, values in pending.items():
+                    self._update(pk, values)
+
+    def _after_soft_rollback(self, session, previous_transaction):
+        if previous_transaction.parent is None:
+            session.info.pop(self._pending_key, None)
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+""":mod:`dodotable.spec` --- table definitions shared between requests
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+:class:`~dodotable.schema.Table` 을 요청마다 처음부터 만들면 열, 필터,
+attribute 를 찾는 함수, 정렬 조건을 매번 다시 만듭니다. :class:`TableSpec` 은
+이것들을 모듈을 불러올 때 한 번 만들어두고, 요청마다
+:meth:`~TableSpec.bind` 로 요청에 따라 달라지는 것만 채운 테이블을 만듭니다.
+
+.. code-block:: python
+
+   from dodotable.condition import Ilike, IlikeSet
+   from dodotable.helper import Limit
+   from dodotable.schema import Column
+   from dodotable.spec import TableSpec
+
+   music_table = TableSpec(Music, u'music', columns=[
+       Column(attr='id', label=u'id', order_by='id.desc'),
+       Column(attr='name', label=u'이름', filters=[
+           Ilike(Music, 'name', None),
+       ]),
+   ])
+   music_table.add_filter(IlikeSet(music_table, None))
+   music_table.add_filter(Limit(music_table, None))
+
+   @app.route('/musics/')
+   def list_musics():
+       table = music_table.bind(request.args, session)
+       return render_template(
+           'list_musics.html',
+           table=table.select(limit=request.args.get('limit'),
+                              offset=request.args.get('offset'))
+       )
+
+"""
+from six import string_types
+
+from .schema import Table
+
+
+__all__ = 'TableSpec',
+
+
+class TableSpec(object):
+    """요청마다 재사용하는 테이블의 정의.
+
+    필터는 ``request_args`` 대신 :const:`None` 을 주고 만들고, 테이블을
+    받는 필터(:class:`~dodotable.condition.IlikeSet`,
+    :class:`~dodotable.helper.Limit`)에는 테이블 대신 스펙을 줍니다.
+    :meth:`bind` 는 열과 필터를 얕게 복사해서 요청의 ``request_args`` 와
+    테이블을 채우므로 스펙의 객체들은 바뀌지 않고, 여러 스레드가 같은 스펙을
+    함께 써도 됩니다. ``request_args`` 가 없는 필터는 복사하지 않고 그대로
+    씁니다.
+
+    열의 ``order_by`` 는 기본 정렬 조건입니다. 요청의 ``order_by`` 가
+    정렬 가능한 열을 가리키면 정렬 가능한 열들의 정렬 조건은 그 값을
+    따릅니다.
+
+    :param cls: 테이블의 엔티티나 쿼리
+    :param label: 테이블의 레이블
+    :param columns: 열들
+    :type columns: :class:`~collections.abc.Sequence`
+    :param unit_label: 행의 단위
+    :param table_class: :meth:`bind` 가 만들 테이블의 클래스.
+                        생략하면 :class:`~dodotable.schema.Table`
+    :param options: ``flat``, ``counter``, ``count_strategy``, ``cache`` 처럼
+                    :class:`~dodotable.schema.Table` 에 그대로 넘길 옵션들
+
+    """
+
+    #: (:class:`str`) 정렬 조건을 담는 쿼리 스트링의 이름.
+    #: ``column.html`` 이 만드는 링크와 같습니다.
+    ORDER_BY_ARG = 'order_by'
+
+    def __init__(self, cls, label, columns, unit_label='row',
+                 table_class=Table, **options):
+        self.cls = cls
+        self.label = label
+        self.unit_label = unit_label
+        self._columns = tuple(columns)
+        self._sortable_attrs = frozenset(column.attr for column in columns
+                                         if column.sortable)
+        self._filters = []
+        self.table_class = table_class
+        self.options = options
+
+    def add_filter(self, filter):
+        """테이블에 붙일 필터를 더합니다. 모듈을 불러올 때, 처음
+        :meth:`bind` 하기 전에 불러야 합니다."""
+        self._filters.append(filter)
+
+    def bind(self, request_args, session=None):
+        """요청 하나를 위한 테이블을 만듭니다.
+
+        :param request_args: 요청의 쿼리 스트링
+        :type request_args: :class:`~collections.abc.Mapping`
+        :param session: 테이블이 쓸 세션. 생략하면
+                        :meth:`Environment.get_session()
+                        <dodotable.environment.Environment.get_session>` 이
+                        주는 세션을 씁니다.
+        :return: 필터와 정렬 조건이 ``request_args`` 를 따르는 테이블
+        :rtype: :attr:`table_class`
+
+        """
+        orders = _parse_order_by(request_args.get(self.ORDER_BY_ARG))
+        if orders is not None and self._sortable_attrs.isdisjoint(orders):
+            orders = None
+        table = self.table_class(
+            self.cls, self.label, unit_label=self.unit_label,
+            columns=[self._bind_column(column, orders, request_args)
+                     for column in self._columns],
+            sqlalchemy_session=session, **self.options
+        )
+        for filter in self._filters:
+            table.add_filter(self._bind_filter(filter, table, request_args))
+        return table
+
+    def _bind_column(self, column, orders, request_args):
+        bound = _copy(column)
+        bound.filters = [self._bind_filter(filter, None, request_args)
+                         for filter in column.filters]
+        if orders is not None and column.sortable:
+            bound.order_by = orders.get(column.attr)
+        return bound
+
+    def _bind_filter(self, filter, table, request_args):
+        if not hasattr(filter, 'request_args'):
+            return filter
+        bound = _copy(filter)
+        bound.request_args = request_args
+        if table is not None and getattr(filter, 'table', None) is self:
+            bound.table = table
+        return bound
+
+
+def _copy(obj):
+    # :func:`copy.copy` goes through ``__reduce_ex__``, which costs most of
+    # :meth:`TableSpec.bind`; columns and filters are plain objects.
+    copied = object.__new__(type(obj))
+    copied.__dict__.update(obj.__dict__)
+    return copied
+
+
+def _parse_order_by(order_by):
+    """``id.desc,name.asc`` 같은 정렬 조건을 ``{attr: order}`` 로
+    바꿉니다. :meth:`Order.of_column()
+    <dodotable.condition.Order.of_column>` 과 같은 규칙을 따릅니다."""
+    from .condition import Order
+    if not order_by or not isinstance(order_by, string_types):
+        return None
+    orders = {}
+    for o in order_by.split(','):
+        attr, _, order = o.strip().rpartition('.')
+        if attr and order in (Order.ASCENDANT, Order.DESCENDANT):
+            orders[attr] = order
+    return orders
@@ -4,16 +4,36 @@
 
 """
 import codecs
+import collections
 import gettext
+import json
 import numbers
+import operator
 import re
+import threading
 
 from jinja2 import Environment, PackageLoader
 from six import PY2, text_type
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+try:
+    from types import MappingProxyType
+except ImportError:
+    MappingProxyType = dict
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 __all__ = (
-    'camel_to_underscore', 'render', '_get_data',
+    'EnvironmentCache', 'TemplateGlobals', 'camel_to_underscore',
+    'data_getter', 'environment_cache',
+    'get_default_loader', 'get_template', 'invalidate_environments',
+    'json_dumps',
+    'render', 'stream', 'supports_window_functions', '_get_data',
     'string_literal',
 )
 
@@ -41,47 +61,328 @@ def camel_to_underscore(name):
     return all_cap_re.sub(r'\1_\2', s1).lower()
 
 
+class EnvironmentCache(object):
+    """템플릿 로더와 로케일마다 하나의 :class:`jinja2.Environment` 를
+    만들어 두고 재사용합니다.
+
+    환경을 만들고 템플릿을 컴파일하는 비용은 처음 한 번만 들고,
+    이후의 :func:`render` 호출은 이미 컴파일된 템플릿을 씁니다.
+    가장 오래 쓰이지 않은 환경부터 버려서 최대 ``maxsize`` 개만 유지합니다.
+
+    템플릿은 자동으로 다시 읽어오지 않으므로 템플릿 파일을 고친 뒤에는
+    :meth:`invalidate` 를 호출해야 합니다.
+
+    :attr:`TemplateGlobals.frozen` 처럼 바뀌지 않는 매핑을 ``globals`` 로
+    주면 환경을 만들 때 한 번만 jinja 전역 변수로 넣어두고, 그 매핑마다
+    따로 환경을 만듭니다.
+
+    :param int maxsize: 유지할 환경의 최대 개수
+
+    """
+
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self._environments = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, loader, locale=None, get_translations=None, globals=None):
+        """``(loader, locale)`` 에 해당하는 환경을 가져옵니다.
+
+        :param loader: jinja template loader
+        :type loader: :class:`jinja2.loaders.BaseLoader`
+        :param locale: 환경을 구분할 로케일
+        :param get_translations: 환경을 새로 만들 때 번역을 가져올
+                                 nullary function
+        :param globals: 환경에 넣어둘 jinja 전역 변수.
+                        바뀌지 않는 매핑이어야 합니다.
+        :type globals: :class:`~collections.abc.Mapping`
+        :return: 컴파일된 템플릿을 들고 있는 jinja 환경
+        :rtype: :class:`jinja2.Environment`
+
+        """
+        key = loader, locale, None if globals is None else id(globals)
+        with self._lock:
+            entry = self._environments.pop(key, None)
+            if entry is not None:
+                self._environments[key] = entry
+                return entry[0]
+        env = Environment(loader=loader,
+                          extensions=['jinja2.ext.i18n', 'jinja2.ext.with_'],
+                          autoescape=True,
+                          auto_reload=False)
+        translations = None
+        if callable(get_translations):
+            translations = get_translations()
+        if translations is None:
+            translations = gettext.NullTranslations()
+        env.install_gettext_translations(translations)
+        if globals is not None:
+            env.globals.update(globals)
+        with self._lock:
+            # keeps ``globals`` alive so that its id is not reused
+            # while the environment is cached
+            entry = self._environments.setdefault(key, (env, globals))
+            while len(self._environments) > self.maxsize:
+                self._environments.popitem(last=False)
+        return entry[0]
+
+    def invalidate(self, loader=None):
+        """캐시된 환경을 버려서 다음 렌더링 때 템플릿을 다시 읽게 합니다.
+
+        :param loader: 이 로더로 만든 환경만 버립니다.
+                       생략하면 모든 환경을 버립니다.
+        :type loader: :class:`jinja2.loaders.BaseLoader`
+
+        """
+        with self._lock:
+            if loader is None:
+                self._environments.clear()
+                return
+            for key in list(self._environments):
+                if key[0] is loader:
+                    del self._environments[key]
+
+    def __len__(self):
+        return len(self._environments)
+
+
+#: (:class:`EnvironmentCache`) :func:`render` 가 사용하는 환경 캐시
+environment_cache = EnvironmentCache()
+
+_default_loader = []
+
+
+def get_default_loader():
+    """dodotable에 들어있는 기본 템플릿의 로더를 가져옵니다.
+
+    :rtype: :class:`jinja2.loaders.PackageLoader`
+
+    """
+    if not _default_loader:
+        _default_loader.append(PackageLoader('dodotable', 'templates'))
+    return _default_loader[0]
+
+
+def invalidate_environments(loader=None):
+    """:data:`environment_cache` 의 환경을 버립니다.
+
+    템플릿을 고친 뒤 다시 읽어오고 싶을 때 호출합니다.
+
+    :param loader: 이 로더로 만든 환경만 버립니다.
+    :type loader: :class:`jinja2.loaders.BaseLoader`
+
+    """
+    environment_cache.invalidate(loader)
+
+
+class TemplateGlobals(Mapping):
+    """객체의 attribute 들을 템플릿에 넘기는 바뀌지 않는 매핑.
+
+    메서드처럼 호출할 수 있는 attribute 는 :attr:`frozen` 에 한 번만
+    담아두고 캐시된 jinja 환경의 전역 변수로 넣어둡니다. 프로퍼티와 호출할
+    수 없는 attribute 는 요청마다 값이 달라질 수 있으므로 담아두지 않고
+    렌더링할 때마다 :meth:`dynamic` 으로 다시 읽습니다.
+
+    :param obj: attribute 를 읽을 객체
+    :param frozen: 미리 읽어둔 호출할 수 있는 attribute 들
+    :type frozen: :class:`~collections.abc.Mapping`
+    :param dynamic_names: 렌더링할 때마다 다시 읽을 attribute 의 이름들
+
+    """
+
+    def __init__(self, obj, frozen, dynamic_names):
+        self._obj = obj
+        #: (:class:`~collections.abc.Mapping`) 미리 읽어둔 호출할 수 있는
+        #: attribute 들
+        self.frozen = MappingProxyType(dict(frozen))
+        self._dynamic_names = tuple(dynamic_names)
+
+    def dynamic(self):
+        """프로퍼티와 호출할 수 없는 attribute 들을 지금 값으로 읽습니다.
+
+        :rtype: :class:`dict`
+
+        """
+        obj = self._obj
+        return {name: getattr(obj, name) for name in self._dynamic_names}
+
+    def __getitem__(self, key):
+        try:
+            return self.frozen[key]
+        except KeyError:
+            if key not in self._dynamic_names:
+                raise
+        return getattr(self._obj, key)
+
+    def __iter__(self):
+        for key in self.frozen:
+            yield key
+        for key in self._dynamic_names:
+            yield key
+
+    def __len__(self):
+        return len(self.frozen) + len(self._dynamic_names)
+
+
+def get_template(template_name, extra_environments=None):
+    """``extra_environments`` 에 맞는 캐시된 환경에서 템플릿을 가져옵니다.
+
+    :param str template_name: 템플릿 이름
+    :param extra_environments: :class:`TemplateGlobals` 또는 템플릿에 넘길
+                               변수들
+    :return: 컴파일된 템플릿
+    :rtype: :class:`jinja2.Template`
+
+    """
+    if extra_environments is None:
+        extra_environments = {}
+    loader = extra_environments.get('template_loader')
+    if not loader:
+        loader = get_default_loader()
+    get_locale = extra_environments.get('get_locale')
+    locale = None
+    if callable(get_locale):
+        from .environment import normalize_locale
+        locale = normalize_locale(get_locale())
+    env = environment_cache.get(
+        loader, locale,
+        extra_environments.get('get_translations'),
+        extra_environments.frozen
+        if isinstance(extra_environments, TemplateGlobals) else None
+    )
+    return env.get_template(template_name)
+
+
+def _context(extra_environments, kwargs):
+    if isinstance(extra_environments, TemplateGlobals):
+        # callables are already bound to the environment as globals
+        context = extra_environments.dynamic()
+    else:
+        context = dict(extra_environments)
+    context.update(kwargs)
+    return context
+
+
 def render(template_name, extra_environments=None, **kwargs):
     """주어진 템플릿을 jinja로 렌더링합니다
 
+    jinja 환경은 :data:`environment_cache` 에 캐시되므로 템플릿은 처음 한 번만
+    컴파일됩니다. ``extra_environments`` 가 :class:`TemplateGlobals` 이면
+    호출할 수 있는 attribute 들은 캐시된 환경에 이미 들어있으므로 매번
+    복사하지 않고 나머지만 다시 읽습니다.
+
     :param template_name:
     :return:
 
     """
     if extra_environments is None:
         extra_environments = {}
-    default_loader = PackageLoader('dodotable', 'templates')
-    loader = extra_environments.get(
-        'template_loader',
-        default_loader)
-    if not loader:
-        loader = default_loader
-    get_translations = extra_environments.get('get_translations')
-    env = Environment(loader=loader,
-                      extensions=['jinja2.ext.i18n', 'jinja2.ext.with_'],
-                      autoescape=True)
-    env.globals.update(extra_environments)
-    translations = get_translations() if callable(get_translations) else None
-    if translations is None:
-        translations = gettext.NullTranslations()
-    env.install_gettext_translations(translations)
-    template = env.get_template(template_name)
-    return template.render(**kwargs)
+    template = get_template(template_name, extra_environments)
+    return template.render(_context(extra_environments, kwargs))
+
+
+def stream(template_name, extra_environments=None, **kwargs):
+    """:func:`render` 와 같지만 결과를 한 번에 만들지 않고 조각조각
+    내보냅니다.
+
+    :param template_name:
+    :return: 렌더링 결과를 차례로 내보내는 스트림
+    :rtype: :class:`jinja2.environment.TemplateStream`
+
+    """
+    if extra_environments is None:
+        extra_environments = {}
+    template = get_template(template_name, extra_environments)
+    return template.stream(_context(extra_environments, kwargs))
+
+
+def supports_window_functions(dialect):
+    """데이터베이스가 ``count(*) OVER ()`` 같은 윈도 함수를 지원하는지
+    확인합니다.
+
+    MySQL처럼 서버 버전을 알아야 하는 경우 아직 연결한 적이 없으면
+    지원하지 않는 것으로 봅니다.
+
+    :param dialect: 확인할 dialect
+    :type dialect: :class:`sqlalchemy.engine.interfaces.Dialect`
+    :rtype: :class:`bool`
+
+    """
+    name = dialect.name
+    if name in ('postgresql', 'oracle', 'mssql'):
+        return True
+    if name == 'sqlite':
+        version = getattr(dialect.dbapi, 'sqlite_version_info', ())
+        return version >= (3, 25)
+    if name == 'mysql':
+        version = dialect.server_version_info
+        if not version:
+            return False
+        if getattr(dialect, 'is_mariadb', False):
+            return version >= (10, 2)
+        return version >= (8,)
+    return False
+
+
+_data_getters = {}
+
+
+def data_getter(attribute_name):
+    """``attribute_name`` 을 따라가서 값을 가져오는 함수를 만듭니다.
+
+    :func:`_get_data` 와 같지만 점으로 구분된 이름을 매번 나누지 않도록
+    :func:`operator.attrgetter` 로 한 번만 컴파일하고, 같은 이름에는 같은
+    함수를 돌려줍니다.
+
+    .. code-block:: python
+
+       >>> get_name = data_getter('artist.name')
+       >>> get_name(music)
+       'Damien Rice'
+       >>> get_name(music_without_artist, 'unknown')
+       'unknown'
+
+    :param str attribute_name: ``.`` 으로 구분된 attribute 이름
+    :return: ``(data, default=None)`` 를 받는 함수.
+             중간에 :exc:`AttributeError` 가 나면 ``default`` 를 돌려줍니다.
+
+    """
+    try:
+        return _data_getters[attribute_name]
+    except KeyError:
+        pass
+    getter = operator.attrgetter(attribute_name)
+
+    def get_data(data, default=None):
+        try:
+            return getter(data)
+        except AttributeError:
+            return default
+
+    return _data_getters.setdefault(attribute_name, get_data)
+
+
+def json_dumps(obj):
+    """``obj`` 를 JSON 문자열로 바꿉니다.
+
+    orjson_ 이 설치되어 있으면 쓰고, 없으면 :func:`json.dumps` 를 씁니다.
+    JSON에 없는 타입의 값은 문자열로 바꿉니다.
+
+    .. _orjson: https://github.com/ijl/orjson
+
+    :param obj: 바꿀 값
+    :return: JSON 문자열
+    :rtype: :class:`str`
+
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=text_type).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'),
+                      default=text_type)
 
 
 def _get_data(data, attribute_name, default):
-    name_chain = attribute_name.split('.')
-
-    def __data__(_data, name_chain):
-        if len(name_chain) > 0:
-            try:
-                return __data__(getattr(_data, name_chain[0]),
-                                name_chain[1:])
-            except AttributeError:
-                return default
-        return _data
-
-    return __data__(data, name_chain)
+    return data_getter(attribute_name)(data, default)
 
 
 if PY2:
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+from mock import PropertyMock, patch
+from pytest import fixture, importorskip, mark, raises, skip
+
+from .entities import Music
+from dodotable.cache import FragmentCache
+from dodotable.environment import AsyncEnvironment
+from dodotable.schema import Column, Table
+
+asyncio = importorskip('asyncio')
+importorskip('aiosqlite')
+sqlalchemy_asyncio = importorskip('sqlalchemy.ext.asyncio')
+AsyncTable = importorskip('dodotable.aio').AsyncTable
+
+
+class AsyncTestEnvironment(AsyncEnvironment):
+
+    def __init__(self, engine=None):
+        super(AsyncTestEnvironment, self).__init__()
+        self.engine = engine
+
+    def build_url(self, *args, **kwargs):
+        queries = ['{}={}'.format(k, v) for k, v in kwargs.items()]
+        return '/?{}'.format('&'.join(sorted(queries)))
+
+    def get_session(self):
+        return None
+
+    def create_session(self):
+        if self.engine is None:
+            return None
+        return sqlalchemy_asyncio.AsyncSession(self.engine)
+
+
+@fixture
+def fx_loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@fixture
+def fx_async_engine(fx_loop, fx_session, fx_musics):
+    url = fx_session.get_bind().url
+    if url.get_backend_name() != 'sqlite' or not url.database:
+        skip('needs a sqlite database file')
+    engine = sqlalchemy_asyncio.create_async_engine(
+        'sqlite+aiosqlite:///' + url.database
+    )
+    yield engine
+    fx_loop.run_until_complete(engine.dispose())
+
+
+def columns():
+    return [
+        Column(attr='id', label=u'id', order_by='id.desc'),
+        Column(attr='name', label=u'name'),
+        Column(attr='artist.name', label=u'artist'),
+    ]
+
+
+def select(loop, engine, offset, limit, **kwargs):
+    session = sqlalchemy_asyncio.AsyncSession(engine)
+    try:
+        table = AsyncTable(cls=Music, label=u'music', columns=columns(),
+                           sqlalchemy_session=session, **kwargs)
+        loop.run_until_complete(table.select(offset, limit))
+        return table, table.__html__()
+    finally:
+        loop.run_until_complete(session.close())
+
+
+@mark.parametrize('create_session', [True, False])
+@mark.parametrize('count_strategy', [Table.COUNT_QUERY, Table.COUNT_WINDOW])
+def test_async_table(fx_loop, fx_session, fx_async_engine, create_session,
+                     count_strategy):
+    environment = AsyncTestEnvironment(
+        fx_async_engine if create_session else None
+    )
+    with patch('dodotable.schema.Schema.environment',
+               new_callable=PropertyMock, return_value=environment):
+        table = Table(cls=Music, label=u'music', columns=columns(),
+                      sqlalchemy_session=fx_session).select(2, 5)
+        html = table.__html__()
+        async_table, async_html = select(fx_loop, fx_async_engine, 2, 5,
+                                         count_strategy=count_strategy)
+    assert async_table.count == table.count == 10
+    assert [[cell.data for cell in row] for row in async_table.rows] == \
+        [[cell.data for cell in row] for row in table.rows]
+    assert async_html == html
+
+
+def test_async_table_counter(fx_loop, fx_async_engine):
+    with patch('dodotable.schema.Schema.environment',
+               new_callable=PropertyMock,
+               return_value=AsyncTestEnvironment(fx_async_engine)):
+        table, _ = select(fx_loop, fx_async_engine, 0, 5,
+                          counter=lambda query: asyncio.sleep(0, 1234))
+    assert table.count == 1234
+    assert len(table.rows) == 5
+
+
+def test_async_table_count_not_fetched():
+    with patch('dodotable.schema.Schema.environment',
+               new_callable=PropertyMock,
+               return_value=AsyncTestEnvironment()):
+        table = AsyncTable(cls=Music, label=u'music', columns=columns(),
+                           sqlalchemy_session=object())
+        with raises(RuntimeError):
+            table.count
+        with raises(NotImplementedError):
+            table.seek()
+
+
+def test_async_table_fragment_cache_to_dict(fx_loop, fx_async_engine):
+    cache = FragmentCache()
+    with patch('dodotable.schema.Schema.environment',
+               new_callable=PropertyMock,
+               return_value=AsyncTestEnvironment(fx_async_engine)):
+        table, html = select(fx_loop, fx_async_engine, 0, 5, cache=cache)
+        expected = table.to_dict()
+        assert len(expected['rows']) == 5
+        table, cached_html = select(fx_loop, fx_async_engine, 0, 5,
+                                    cache=cache)
+        assert cached_html == html
+        assert table.to_dict() == expected
+
+
+class CountSession(object):
+
+    def __init__(self, events):
+        self.events = events
+
+    async def close(self):
+        self.events.append('close')
+
+
+def test_async_table_page_error_waits_for_count(fx_loop):
+    events = []
+    environment = AsyncTestEnvironment()
+    environment.create_session = lambda: CountSession(events)
+
+    async def fetch(query, session):
+        raise ValueError('page')
+
+    async def fetch_count(session=None):
+        await asyncio.sleep(0.01)
+        events.append('count')
+        return 10
+
+    with patch('dodotable.schema.Schema.environment',
+               new_callable=PropertyMock, return_value=environment):
+        table = AsyncTable(cls=Music, label=u'music', columns=columns(),
+                           sqlalchemy_session=object())
+        with patch.object(table, '_fetch', fetch), \
+                patch.object(table, 'fetch_count', fetch_count):
+            with raises(ValueError):
+                fx_loop.run_until_complete(
+                    table._fetch_page_and_count(table.query)
+                )
+    # the count session is closed only after the count is done
+    assert events == ['count', 'close']
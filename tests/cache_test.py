@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+from mock import PropertyMock, patch
+
+from .entities import Artist, Label, Music
+from .helper import DodotableTestEnvironment
+from dodotable.cache import (FragmentCache, LRUCache, ResultCache,
+                             statement_key)
+from dodotable.loading import StatementCounter
+from dodotable.schema import Column, LinkedCell, LinkedColumn, ObjectColumn
+
+
+def test_lru_cache():
+    cache = LRUCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    cache.delete('a')
+    assert cache.get('a') is None
+    assert len(cache) == 1
+
+
+def test_lru_cache_timeout():
+    cache = LRUCache(timeout=10)
+    with patch('dodotable.cache._clock', return_value=100):
+        cache.set('a', 1)
+        cache.set('b', 2, timeout=0)
+        cache.set('c', 3, timeout=30)
+    with patch('dodotable.cache._clock', return_value=115):
+        assert cache.get('a') is None
+        assert cache.get('b') == 2
+        assert cache.get('c') == 3
+
+
+def test_statement_key_reuses_compiled(fx_session):
+    def query(word, offset):
+        return fx_session.query(Music) \
+                         .filter(Music.name.ilike(word)) \
+                         .order_by(Music.id) \
+                         .offset(offset).limit(10)
+    with patch('dodotable.cache._compiled_statements', LRUCache()) as cache:
+        sql, params = statement_key(query(u'%a%', 0))
+        assert len(cache) == 1
+        assert statement_key(query(u'%b%', 20)) == (
+            sql, tuple(sorted(dict(params, name_1=u'%b%',
+                                   param_1=10, param_2=20).items()))
+        )
+        assert len(cache) == 1
+    compiled = query(u'%b%', 20).statement.compile(
+        dialect=fx_session.get_bind().dialect
+    )
+    assert statement_key(query(u'%b%', 20)) == \
+        (str(compiled), tuple(sorted(compiled.params.items())))
+
+
+@patch('dodotable.schema.Schema.environment', new_callable=PropertyMock,
+       return_value=DodotableTestEnvironment())
+def test_fragment_cache(environ, fx_session, fx_musics, fx_music_table):
+    cache = FragmentCache()
+    html = fx_music_table(cache=cache).select(0, 5).__html__()
+    with StatementCounter(fx_session) as counter:
+        table = fx_music_table(cache=cache).select(0, 5)
+        assert table.__html__() == html
+        assert table.count == 10
+        assert table.pager.count == 10
+    assert counter.count == 0
+    with StatementCounter(fx_session) as counter:
+        assert fx_music_table(cache=cache).select(5, 5).__html__() != html
+    assert counter.count
+    fx_session.add(Music(name=u'new'))
+    fx_session.commit()
+    assert fx_music_table(cache=cache).select(0, 5).__html__() == html
+    cache.invalidate(Music)
+    table = fx_music_table(cache=cache).select(0, 5)
+    assert table.rows
+    assert table.__html__() != html
+    assert table.count == 11
+
+
+@patch('dodotable.schema.Schema.environment', new_callable=PropertyMock,
+       return_value=DodotableTestEnvironment())
+def test_fragment_cache_to_dict(environ, fx_session, fx_musics,
+                                fx_music_table):
+    cache = FragmentCache()
+    result_cache = ResultCache()
+    table = fx_music_table(cache=cache).select(0, 5)
+    table.__html__()
+    expected = table.to_dict()
+    assert len(expected['rows']) == 5
+    table = fx_music_table(cache=cache).select(0, 5)
+    assert not table.rows
+    assert table.to_dict() == expected
+    table = fx_music_table(cache=cache).select(0, 5)
+    table.result_cache = result_cache
+    assert table.to_dict() == expected
+    table = fx_music_table(cache=cache).select(0, 5)
+    table.result_cache = result_cache
+    with StatementCounter(fx_session) as counter:
+        assert table.to_dict() == expected
+        assert table.__html__()
+    assert counter.count == 0
+
+
+@patch('dodotable.schema.Schema.environment', new_callable=PropertyMock,
+       return_value=DodotableTestEnvironment())
+def test_fragment_cache_related_entities(environ, fx_session, fx_musics,
+                                         fx_music_table):
+    cache = FragmentCache()
+    columns = [Column(attr='name', label=u'name'),
+               Column(attr='artist.name', label=u'artist')]
+    html = fx_music_table(columns, cache=cache).select(0, 5).__html__()
+    cache.invalidate(Label)
+    with StatementCounter(fx_session) as counter:
+        fx_music_table(columns, cache=cache).select(0, 5).__html__()
+    assert counter.count == 0
+    fx_session.query(Artist).update({'name': u'renamed'})
+    fx_session.commit()
+    cache.invalidate(Artist)
+    html2 = fx_music_table(columns, cache=cache).select(0, 5).__html__()
+    assert html2 != html
+    assert u'renamed' in html2
+
+
+@patch('dodotable.schema.Schema.environment', new_callable=PropertyMock,
+       return_value=DodotableTestEnvironment(locale_selector=lambda: 'ko'))
+def test_fragment_cache_key(environ, fx_musics, fx_music_table):
+    cache = FragmentCache()
+    table = fx_music_table(cache=cache).select(0, 5)
+    key = table._fragment_key
+    assert fx_music_table(cache=cache).select(0, 5)._fragment_key == key
+    environ.return_value = DodotableTestEnvironment(
+        locale_selector=lambda: 'en'
+    )
+    assert fx_music_table(cache=cache).select(0, 5)._fragment_key != key
+
+
+@patch('dodotable.schema.Schema.environment', new_callable=PropertyMock,
+       return_value=DodotableTestEnvironment())
+def test_result_cache(environ, fx_session, fx_musics, fx_music_table):
+    cache = ResultCache()
+    columns = [
+        Column(attr='name', label=u'name'),
+        LinkedColumn(attr='artist.name', label=u'artist',
+                     endpoint=lambda music: '/artists/{}'.format(
+                         music.artist_id
+                     )),
+    ]
+    table = fx_music_table(columns).select(0, 5)
+    html = table.__html__()
+    fx_music_table(columns, result_cache=cache).select(0, 5)
+    with StatementCounter(fx_session) as counter:
+        table = fx_music_table(columns, result_cache=cache).select(0, 5)
+        assert table.count == 10
+        assert len(table.rows) == 5
+        assert table.__html__() == html
+    assert counter.count == 0
+    assert isinstance(table.rows[0][2], LinkedCell)
+    cache.invalidate(Artist)
+    with StatementCounter(fx_session) as counter:
+        fx_music_table(columns, result_cache=cache).select(0, 5)
+    assert counter.count
+
+
+@patch('dodotable.schema.Schema.environment', new_callable=PropertyMock,
+       return_value=DodotableTestEnvironment())
+def test_result_cache_skips_objects(environ, fx_musics, fx_music_table):
+    cache = ResultCache()
+    for column in (ObjectColumn(attr='name', label=u'object'),
+                   Column(attr='artist', label=u'artist')):
+        columns = [Column(attr='name', label=u'name'), column]
+        fx_music_table(columns, result_cache=cache).select(0, 5)
+        assert not [key for key in cache.backend._values
+                    if key.startswith('dodotable:result:')]
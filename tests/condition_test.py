@@ -8,6 +8,7 @@ from .entities import Music, Tag
 from .helper import DodotableTestEnvironment, extract_soup
 from dodotable.condition import (Ilike, IlikeAlias, IlikeSet, SelectFilter,
                                  create_search_name)
+from dodotable.helper import Category, Limit
 from dodotable.schema import Column, Table
 from dodotable.util import camel_to_underscore
 
@@ -109,3 +110,80 @@ def test_ilike_alias(fx_tags, t, fx_session):
                     .filter(IlikeAlias('tag_type', alias_type,
                                        {'select.tag_type': t}).__query__())
     assert all([tg.t == t for tg in tag])
+
+
+def test_table_filter_buckets(fx_session):
+    request_args = {}
+    table = Table(Tag, 'a', columns=[
+        Column('t', 't'),
+    ], sqlalchemy_session=fx_session)
+    choices = [{'name': 'genre', 'description': ''}]
+    category = Category(Tag, 't', choices, request_args)
+    select_filter = SelectFilter(Tag, 't', choices, request_args)
+    limit = Limit(table, request_args)
+    ilike_set = IlikeSet(table, request_args)
+    table.add_filter(category)
+    table.add_filter(select_filter)
+    assert table.categories == [category]
+    assert table.renderable_filters == [select_filter]
+    assert table.limits == []
+    table.add_filter(limit)
+    table.add_filter(ilike_set)
+    table.add_filter(Ilike(Tag, 'name', request_args))
+    assert table.categories == [category]
+    assert table.renderable_filters == [select_filter, ilike_set]
+    assert table.limits == [limit]
+
+
+@patch('dodotable.schema.Schema.environment', new_callable=PropertyMock,
+       return_value=DodotableTestEnvironment())
+def test_filters_json(environ, fx_tags, fx_session):
+    request_args = {'select.t': 'genre', 'search_tag.word': u'acou',
+                    'search_tag.type': 'name', 'limit': '50'}
+    table = Table(Tag, 'a', columns=[
+        Column('t', 't'),
+        Column('name', 'name', filters=[Ilike(Tag, 'name', request_args)]),
+    ], sqlalchemy_session=fx_session)
+    choices = [{'name': 'genre', 'description': u'장르'}]
+    table.add_filter(Category(Tag, 't', choices, request_args))
+    table.add_filter(IlikeSet(table, request_args))
+    table.add_filter(Limit(table, request_args))
+    table.add_filter(Ilike(Tag, 'name', request_args))
+    category, ilike_set, limit = table.select().to_dict()['filters']
+    assert category == {
+        'kind': 'category',
+        'name': 'select.t',
+        'value': 'genre',
+        'choices': [{'name': 'all', 'description': u'모두'},
+                    {'name': 'genre', 'description': u'장르'}],
+    }
+    assert ilike_set == {
+        'kind': 'search',
+        'name': 'search_tag.word',
+        'value': u'acou',
+        'type_name': 'search_tag.type',
+        'type_value': 'name',
+        'columns': [{'attr': 'name', 'label': u'name'}],
+    }
+    assert limit == {'kind': 'limit', 'name': 'limit_tag', 'value': 50,
+                     'choices': [10, 50, 100, 200]}
+
+
+@mark.parametrize('limit, value', [
+    ('50', 50), ('50.0', 50), ('abc', 0), (None, 0), ('inf', 0),
+    ('-inf', 0), ('nan', 0),
+])
+@patch('dodotable.schema.Schema.environment', new_callable=PropertyMock,
+       return_value=DodotableTestEnvironment())
+def test_limit_bad_input(environ, fx_session, limit, value):
+    table = Table(Tag, 'a', columns=[Column('t', 't')],
+                  sqlalchemy_session=fx_session)
+    helper = Limit(table, {'limit': limit})
+    assert helper.__json__()['value'] == value
+    soup = extract_soup(helper)
+    assert len(soup.find_all('option')) == len(Limit.CHOICES)
+    selected = soup.find('option', selected=True)
+    if value in Limit.CHOICES:
+        assert selected.get('data-url') == '/?limit={}&offset=0'.format(value)
+    else:
+        assert selected is None
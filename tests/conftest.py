@@ -4,7 +4,8 @@ from pytest import fixture, yield_fixture
 from sqlalchemy.engine import create_engine
 from sqlalchemy.orm import Session
 
-from .entities import Base, Music, Tag
+from .entities import Artist, Base, Label, Music, Tag
+from dodotable.schema import Column, Table
 
 TEST_DATABASE_URL = os.environ.get('DODOTABLE_TEST_DATABASE_URL',
                                    'sqlite:///dodotable_test.db')
@@ -41,3 +42,50 @@ def fx_tags(fx_session):
     fx_session.add(country)
     fx_session.commit()
     return genre, country
+
+
+@fixture
+def fx_musics(fx_session):
+    label = Label(name=u'Heffa')
+    artists = [
+        Artist(name=u'Damien Rice', biography=u'...', label=label),
+        Artist(name=u'Lisa Hannigan', biography=u'...'),
+    ]
+    musics = [
+        Music(name=u'song {}'.format(n), lyrics=u'la ' * 100,
+              artist=artists[n % 2])
+        for n in range(10)
+    ]
+    fx_session.add_all(musics)
+    fx_session.commit()
+    fx_session.expire_all()
+    return musics
+
+
+@fixture
+def fx_add_musics(fx_session):
+    """Return a function adding ``count`` musics named ``music {n}``."""
+    def add_musics(count, name=u'music {}'.format):
+        musics = [Music(name=name(n)) for n in range(count)]
+        fx_session.add_all(musics)
+        fx_session.commit()
+        return musics
+    return add_musics
+
+
+@fixture
+def fx_music_table(fx_session):
+    """Return a function building a table of musics.
+
+    The table has an ``id`` column sorted by ``order_by`` followed by
+    ``columns`` (a ``name`` column if omitted), and takes the other keyword
+    arguments as its options.
+
+    """
+    def music_table(columns=None, order_by='id.asc', **kwargs):
+        if columns is None:
+            columns = [Column(attr='name', label=u'name')]
+        return Table(cls=Music, label=u'music', columns=[
+            Column(attr='id', label=u'id', order_by=order_by),
+        ] + list(columns), sqlalchemy_session=fx_session, **kwargs)
+    return music_table
@@ -1,17 +1,52 @@
+import datetime
+import uuid
+
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.schema import Column
-from sqlalchemy.types import Integer, Unicode
+from sqlalchemy.orm import relationship
+from sqlalchemy.schema import Column, ForeignKey
+from sqlalchemy.types import (CHAR, DateTime, Integer, Time, TypeDecorator,
+                              Unicode, UnicodeText)
 
 
 Base = declarative_base()
 
 
+class Label(Base):
+
+    id = Column(Integer, primary_key=True)
+
+    name = Column(Unicode, nullable=False)
+
+    __tablename__ = 'label'
+
+
+class Artist(Base):
+
+    id = Column(Integer, primary_key=True)
+
+    name = Column(Unicode, nullable=False)
+
+    biography = Column(UnicodeText)
+
+    label_id = Column(Integer, ForeignKey(Label.id))
+
+    label = relationship(Label)
+
+    __tablename__ = 'artist'
+
+
 class Music(Base):
 
     id = Column(Integer, primary_key=True)
 
     name = Column(Unicode, nullable=False)
 
+    lyrics = Column(UnicodeText)
+
+    artist_id = Column(Integer, ForeignKey(Artist.id))
+
+    artist = relationship(Artist, backref='musics')
+
     __tablename__ = 'music'
 
 
@@ -24,3 +59,58 @@ class Tag(Base):
     t = Column(Unicode, nullable=False)
 
     __tablename__ = 'tag'
+
+
+class UTCTimezone(datetime.tzinfo):
+
+    def utcoffset(self, dt):
+        return datetime.timedelta(0)
+
+    dst = utcoffset
+
+    def tzname(self, dt):
+        return 'UTC'
+
+
+UTC = UTCTimezone()
+
+
+class GUID(TypeDecorator):
+    """:class:`uuid.UUID` stored as 32 hex digits on any database."""
+
+    impl = CHAR(32)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else value.hex
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else uuid.UUID(value)
+
+
+class UTCDateTime(TypeDecorator):
+    """Timezone-aware UTC datetime, like PostgreSQL ``timestamptz``."""
+
+    impl = DateTime
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return value.astimezone(UTC).replace(tzinfo=None)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else value.replace(tzinfo=UTC)
+
+
+class Event(Base):
+
+    id = Column(GUID, primary_key=True, default=uuid.uuid4)
+
+    name = Column(Unicode)
+
+    created_at = Column(UTCDateTime, nullable=False)
+
+    starts_at = Column(Time)
+
+    __tablename__ = 'event'
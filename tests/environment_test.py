@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+import gettext
+
+from jinja2 import DictLoader
+from mock import patch
+from pytest import importorskip, raises
+
+from dodotable.environment import (Environment, load_translations,
+                                   normalize_locale, resolve_class)
+from dodotable.helper import Category
+from dodotable.util import get_template, render
+
+
+def test_load_translations_cached():
+    translations = load_translations('ko_KR')
+    assert load_translations('ko-KR') is translations
+    with patch('gettext.translation') as translation:
+        assert load_translations('ko_KR') is translations
+        assert load_translations('ko') is load_translations('ko')
+        # shipped catalogs were loaded on import
+        load_translations('ja')
+        assert not translation.called
+
+
+def test_normalize_locale():
+    with patch('dodotable.environment.Locale', None), \
+            patch.dict('dodotable.environment._normalized_locales',
+                       clear=True):
+        assert normalize_locale(None) is None
+        assert normalize_locale('ko-kr') == 'ko'
+        assert normalize_locale('JA') == 'ja'
+        assert normalize_locale('xx_YY') is None
+        assert normalize_locale('../../etc') is None
+
+
+def test_normalize_locale_babel():
+    babel = importorskip('babel')
+    with patch.dict('dodotable.environment._normalized_locales', clear=True):
+        assert normalize_locale('ko-kr') == 'ko_KR'
+        assert normalize_locale(babel.Locale('ja')) == 'ja'
+        assert normalize_locale('not a locale') is None
+
+
+def test_load_translations_bounded():
+    from dodotable import environment
+    with patch.object(environment, 'NORMALIZED_LOCALES_MAXSIZE', 2), \
+            patch.dict(environment._normalized_locales, clear=True), \
+            patch.dict(environment._translations):
+        size = len(environment._translations)
+        translations = load_translations('unknown-0')
+        for i in range(10):
+            assert load_translations('unknown-{}'.format(i)) is translations
+        assert len(environment._normalized_locales) == 2
+        assert len(environment._translations) <= size + 1
+
+
+def test_get_translations():
+    assert Environment().get_translations() is None
+    assert Environment(lambda: None).get_translations() is None
+    environment = Environment(lambda: 'ko')
+    assert environment.get_translations() is load_translations('ko')
+
+
+def test_template_globals():
+    environment = Environment(lambda: 'ko')
+    template_globals = environment.template_globals
+    assert environment.template_globals is template_globals
+    assert template_globals['get_locale']() == 'ko'
+    assert 'template_globals' not in template_globals
+    assert 'get_session' not in template_globals
+    with raises(TypeError):
+        template_globals['get_locale'] = None
+    assert environment.__dict__() == dict(template_globals)
+    environment.get_locale = lambda: 'ja'
+    assert environment.template_globals is not template_globals
+    assert environment.template_globals['get_locale']() == 'ja'
+
+
+class TemplateEnvironment(Environment):
+
+    label = 'dodotable'
+
+    template_loader = DictLoader({
+        'a.html': '{{ label }}',
+        'trans.html': '{% trans %}Next{% endtrans %}',
+    })
+
+    def get_translations(self):
+        locale = self.get_locale and self.get_locale()
+        if locale is None:
+            return None
+        translations = gettext.NullTranslations()
+        translations.gettext = translations.ugettext = \
+            lambda message: u'{}:{}'.format(locale, message)
+        return translations
+
+
+def test_template_globals_bound_once():
+    environment = TemplateEnvironment()
+    template_globals = environment.template_globals
+    template = get_template('a.html', template_globals)
+    assert template.globals['build_url'] == environment.build_url
+    # non-callable attributes are read on every render instead
+    assert 'label' not in template.globals
+    assert template_globals['label'] == 'dodotable'
+    assert render('a.html', template_globals) == 'dodotable'
+
+
+class UserEnvironment(TemplateEnvironment):
+
+    template_loader = DictLoader({'hello.html': 'hello {{ user }}'})
+
+    def __init__(self, users):
+        super(UserEnvironment, self).__init__()
+        self.users = users
+
+    @property
+    def user(self):
+        return self.users.pop(0)
+
+
+def test_template_globals_properties_not_frozen():
+    environment = UserEnvironment(['alice', 'bob'])
+    template_globals = environment.template_globals
+    assert render('hello.html', template_globals) == 'hello alice'
+    assert environment.template_globals is template_globals
+    assert render('hello.html', template_globals) == 'hello bob'
+    assert not environment.users
+
+
+def test_render_translations_per_locale():
+    locale = ['ko']
+    environment = TemplateEnvironment(lambda: locale[0])
+    assert render('trans.html', environment.template_globals) == u'ko:Next'
+    locale[0] = 'ja'
+    assert render('trans.html', environment.template_globals) == u'ja:Next'
+    locale[0] = None
+    assert render('trans.html', environment.template_globals) == u'Next'
+
+
+def test_resolve_class():
+    assert resolve_class('dodotable.helper:Category') is Category
+    with patch('dodotable.environment.__import__', create=True) as import_:
+        assert resolve_class('dodotable.helper:Category') is Category
+        assert not import_.called
+    assert resolve_class('dodotable.helper:Unknown') is None
+    assert resolve_class('dodotable.unknown:Category') is None
+    assert resolve_class('dodotable.helper') is None
+    environment = Environment()
+    assert environment.isinstance(Category.__new__(Category),
+                                  'dodotable.helper:Category')
+    assert not environment.isinstance(object(), 'dodotable.helper:Category')
+    assert not environment.isinstance(object(), 'dodotable.helper:Unknown')
+    assert environment.isinstance(object(), object)
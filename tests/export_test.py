@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+import csv
+import json
+
+from mock import PropertyMock, patch
+from pytest import raises
+from six import StringIO
+
+from .entities import Music
+from .helper import DodotableTestEnvironment
+from dodotable.schema import Cell, Column, ObjectColumn, Queryable
+
+
+class NameFilter(Queryable):
+
+    def __query__(self):
+        return Music.name == u'song 1'
+
+
+def columns():
+    return [
+        Column(attr='name', label=u'이름'),
+        Column(attr='artist.name', label=u'artist',
+               _repr=lambda name: u'by ' + name),
+        ObjectColumn(attr='id', label=u'object',
+                     _repr=lambda music: u'#{}'.format(music.id)),
+        Column(attr='lyrics', label=u'lyrics', visible=False),
+    ]
+
+
+@patch('dodotable.schema.Schema.environment', new_callable=PropertyMock,
+       return_value=DodotableTestEnvironment())
+def test_export_csv(environ, fx_musics, fx_music_table):
+    table = fx_music_table(columns(), order_by='id.desc')
+    fp = StringIO()
+    with patch.object(Cell, '__init__') as cell_init:
+        assert table.export(fp, yield_per=3) == 10
+    assert not cell_init.called
+    rows = list(csv.reader(StringIO(fp.getvalue())))
+    assert rows[0] == [u'id', u'이름', u'artist', u'object']
+    musics = sorted(fx_musics, key=lambda music: music.id, reverse=True)
+    assert rows[1:] == [
+        [str(music.id), music.name, u'by ' + music.artist.name,
+         u'#{}'.format(music.id)]
+        for music in musics
+    ]
+
+
+@patch('dodotable.schema.Schema.environment', new_callable=PropertyMock,
+       return_value=DodotableTestEnvironment())
+def test_export_ndjson(environ, fx_musics, fx_music_table):
+    table = fx_music_table(columns(), order_by='id.desc')
+    table.add_filter(NameFilter())
+    fp = StringIO()
+    assert table.export(fp, format='ndjson') == 1
+    music = fx_musics[1]
+    assert [json.loads(line) for line in fp.getvalue().splitlines()] == [
+        {
+            u'id': music.id,
+            u'이름': u'song 1',
+            u'artist': u'by Lisa Hannigan',
+            u'object': u'#{}'.format(music.id),
+        },
+    ]
+    with raises(ValueError):
+        table.export(fp, format='xml')
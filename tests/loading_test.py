@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+from mock import PropertyMock, patch
+from pytest import mark
+from six import StringIO
+
+from .entities import Artist, Music
+from .helper import DodotableTestEnvironment
+from dodotable.loading import LoadPlan, StatementCounter
+from dodotable.schema import Column, LinkedColumn, ObjectColumn, Table
+
+
+def test_load_plan():
+    plan = LoadPlan(Music, ['name', 'artist.name', 'artist.label.name'])
+    assert plan.columns == ['name', 'artist_id']
+    assert not plan.complete
+    artist = plan.relationships['artist']
+    assert artist.columns == ['id', 'name', 'label_id']
+    assert list(artist.relationships) == ['label']
+    assert len(plan.options(projection=True)) == 3
+    assert len(plan.options()) == 2
+
+
+def test_load_plan_complete():
+    plan = LoadPlan(Music, ['name', None])
+    assert plan.complete
+    plan = LoadPlan(Music, ['artist'])
+    assert not plan.complete
+    assert plan.relationships['artist'].complete
+    # unmapped attributes can't be projected
+    plan = LoadPlan(Music, ['name', '__tablename__'])
+    assert plan.complete
+
+
+@patch('dodotable.schema.Schema.environment', new_callable=PropertyMock,
+       return_value=DodotableTestEnvironment())
+def test_table_projection(environ, fx_session, fx_musics, fx_music_table):
+    columns = [
+        Column(attr='name', label=u'name'),
+        Column(attr='artist.name', label=u'artist'),
+    ]
+    html = fx_music_table(columns).select().__html__()
+    fx_session.expire_all()
+    with StatementCounter(fx_session, keyword='select') as counter:
+        table = fx_music_table(columns, projection=True).select()
+        assert table.__html__() == html
+    music_query, artist_query = [statement
+                                 for statement in counter.statements
+                                 if 'count(' not in statement]
+    assert 'lyrics' not in music_query
+    assert 'biography' not in artist_query
+    assert 'artist.name' in artist_query
+
+
+@patch('dodotable.schema.Schema.environment', new_callable=PropertyMock,
+       return_value=DodotableTestEnvironment())
+def test_table_projection_object_column(environ, fx_musics, fx_music_table):
+    table = fx_music_table([
+        ObjectColumn(attr='name', label=u'name',
+                     _repr=lambda music: music.lyrics),
+    ], projection=True)
+    assert 'lyrics' in str(table.query)
+    assert table.select().rows[0][1].data.lyrics
+
+
+def test_table_projection_query(fx_session, fx_musics):
+    table = Table(cls=fx_session.query(Artist), label=u'artist', columns=[
+        Column(attr='name', label=u'name'),
+    ], sqlalchemy_session=fx_session, projection=True)
+    assert 'biography' in str(table.query)
+
+
+@mark.parametrize('eager_load, expected', [
+    (LoadPlan.SELECTIN, 4),  # page, count, artists, labels
+    (LoadPlan.JOINED, 2),  # page with joins, count
+])
+@patch('dodotable.schema.Schema.environment', new_callable=PropertyMock,
+       return_value=DodotableTestEnvironment())
+def test_table_eager_load(environ, fx_session, fx_musics, fx_music_table,
+                          eager_load, expected):
+    columns = [
+        Column(attr='artist.name', label=u'artist'),
+        LinkedColumn(attr='name', label=u'name',
+                     endpoint=lambda m: '/labels/{}'.format(
+                         m.artist.label.name if m.artist.label else ''
+                     ),
+                     endpoint_attrs=['artist.label']),
+    ]
+    html = fx_music_table(columns, eager_load=None).select().__html__()
+    fx_session.expire_all()
+    with StatementCounter(fx_session) as counter:
+        table = fx_music_table(columns, eager_load=eager_load)
+        assert table.select().__html__() == html
+    assert counter.count == expected
+
+
+@patch('dodotable.schema.Schema.environment', new_callable=PropertyMock,
+       return_value=DodotableTestEnvironment())
+def test_table_lazy_load(environ, fx_session, fx_musics, fx_music_table):
+    with StatementCounter(fx_session) as counter:
+        fx_music_table([
+            Column(attr='artist.name', label=u'artist'),
+        ], eager_load=None).select().__html__()
+    # page, count and one for each artist
+    assert counter.count == 4
+
+
+@patch('dodotable.schema.Schema.environment', new_callable=PropertyMock,
+       return_value=DodotableTestEnvironment())
+def test_table_eager_load_collection_streams(environ, fx_session, fx_musics):
+    def artist_table():
+        return Table(cls=Artist, label=u'artist', columns=[
+            Column(attr='name', label=u'name', order_by='name.asc'),
+            Column(attr='musics', label=u'songs', _repr=len),
+        ], sqlalchemy_session=fx_session, eager_load=LoadPlan.JOINED)
+    html = u''.join(artist_table().iter_html(0, 10))
+    assert html == artist_table().select(0, 10).__html__()
+    assert u'Damien Rice' in html
+    fp = StringIO()
+    assert artist_table().export(fp) == 2
+    assert fp.getvalue().splitlines()[1:] == [u'Damien Rice,5',
+                                              u'Lisa Hannigan,5']
@@ -1,11 +1,24 @@
 # -*- coding: utf-8 -*-
+import base64
+import datetime
+import decimal
+import json
 import re
+import threading
+import uuid
 
+from bs4 import BeautifulSoup
 from mock import PropertyMock, patch
+from pytest import importorskip, mark, raises
+from sqlalchemy.orm import Session
 
-from .entities import Music
+from .entities import UTC, Artist, Event, Music
 from .helper import DodotableTestEnvironment, extract_soup
-from dodotable.schema import Cell, Column, Pager, Row, Table
+from dodotable.condition import Ilike, IlikeSet
+from dodotable.exc import BadCursor
+from dodotable.loading import StatementCounter
+from dodotable.schema import (Cell, Column, LinkedCell, LinkedColumn, Pager,
+                              Row, SeekPager, Table, _window_countable)
 
 
 def test_cell():
@@ -31,6 +44,20 @@ def test_row(environ):
     assert len(tr.find_all('td')) == cell_length
 
 
+def test_compact_row():
+    row = Row()
+    cells = [Cell(n, 0, n) for n in range(3)]
+    row.extend(cells[1:])
+    row.insert(0, cells[0])
+    assert list(row) == cells
+    assert len(row) == 3
+    assert row[-1] is cells[-1]
+    for compact in row, cells[0], LinkedCell(0, 0, 'data', '/'):
+        assert not hasattr(compact, '__dict__')
+        with raises(AttributeError):
+            compact.unknown_attribute = True
+
+
 @patch('dodotable.schema.Schema.environment', new_callable=PropertyMock,
        return_value=DodotableTestEnvironment())
 def test_column(environ):
@@ -138,3 +165,424 @@ def test_pager():
     pager = Pager(count=1000, limit=10, offset=90)
     p = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 100]
     assert pager.pages == list(to_page(p, 10))
+
+
+def test_pager_pages_memoized():
+    pager = Pager(count=1000, limit=10, offset=100)
+    assert pager.pages is pager.pages
+    assert pager.prev_page == pager.from_page_number(10)
+    assert pager.next_page == pager.from_page_number(21)
+    assert pager.leading_ellipsis
+    assert pager.trailing_ellipsis
+    pager.offset = 0
+    assert pager.pages == list(to_page([1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 100],
+                                       1))
+    assert not pager.leading_ellipsis
+    pager = Pager(count=5, limit=10, offset=0)
+    assert pager.pages == list(to_page([1], 1))
+    assert pager.prev_page == pager.next_page == pager.pages[0]
+    assert not pager.leading_ellipsis
+    assert not pager.trailing_ellipsis
+
+
+@patch('dodotable.schema.Schema.environment', new_callable=PropertyMock,
+       return_value=DodotableTestEnvironment())
+def test_flat_table(environ, fx_session, fx_add_musics):
+    fx_add_musics(25)
+
+    def build(flat):
+        table = Table(cls=Music, label=u'flat', columns=[
+            Column(attr='id', label=u'id', order_by='id.desc'),
+            Column(attr='name', label=u'이름', classes=('name',)),
+            LinkedColumn(attr='name', label=u'link',
+                         endpoint=lambda m: '/music/{}'.format(m.id)),
+            MockColumn(attr='id', label=u'button'),
+        ], sqlalchemy_session=fx_session, flat=flat)
+        return table.select(offset=10, limit=10)
+
+    html = build(flat=False).__html__()
+    flat_html = build(flat=True).__html__()
+    assert '<button>' in flat_html
+    assert flat_html == html
+
+
+@mark.parametrize('flat', [False, True])
+@patch('dodotable.schema.Schema.environment', new_callable=PropertyMock,
+       return_value=DodotableTestEnvironment())
+def test_table_iter_html(environ, fx_session, fx_add_musics, flat):
+    fx_add_musics(25)
+
+    def build():
+        return Table(cls=Music, label=u'stream', columns=[
+            Column(attr='id', label=u'id', order_by='id.desc'),
+            Column(attr='name', label=u'이름'),
+        ], sqlalchemy_session=fx_session, flat=flat)
+
+    html = build().select(offset=0, limit=20).__html__()
+    table = build()
+    chunks = list(table.iter_html(offset=0, limit=20, yield_per=5,
+                                  buffer_size=10))
+    assert len(chunks) > 1
+    assert u''.join(chunks) == html
+    # rows were streamed, not kept
+    assert not table.rows
+
+
+@patch('dodotable.schema.Schema.environment', new_callable=PropertyMock,
+       return_value=DodotableTestEnvironment())
+def test_table_iter_html_empty(environ, fx_session):
+    table = Table(cls=Music, label=u'stream', columns=[
+        Column(attr='id', label=u'id'),
+    ], sqlalchemy_session=fx_session)
+    soup = BeautifulSoup(u''.join(table.iter_html()), 'lxml')
+    assert soup.find('td', class_='table-empty-data')
+
+
+@patch('dodotable.schema.Schema.environment', new_callable=PropertyMock,
+       return_value=DodotableTestEnvironment())
+def test_table_count_once(environ, fx_session, fx_music):
+    table = Table(cls=Music, label=u'count', columns=[
+        Column(attr='id', label=u'id'),
+    ], sqlalchemy_session=fx_session)
+    with StatementCounter(fx_session, keyword='count(') as counter:
+        table.select().__html__()
+        table.__html__()
+        assert counter.count == 1
+        fx_session.add(Music(name=u'another'))
+        fx_session.commit()
+        assert table.select().count == 2
+        assert counter.count == 2
+        table.add_filter(IlikeSet(table, {}))
+        assert table.count == 2
+        assert counter.count == 3
+
+
+@patch('dodotable.schema.Schema.environment', new_callable=PropertyMock,
+       return_value=DodotableTestEnvironment())
+def test_table_criteria_once(environ, fx_session, fx_music):
+    request_args = {'search_music.word': u'crime',
+                    'search_music.type': 'name'}
+    ilike = Ilike(Music, 'name', request_args)
+    table = Table(cls=Music, label=u'criteria', columns=[
+        Column(attr='id', label=u'id'),
+        Column(attr='name', label=u'name', filters=[ilike]),
+    ], sqlalchemy_session=fx_session)
+    table.add_filter(IlikeSet(table, request_args))
+    with patch.object(ilike, 'strategy') as strategy:
+        strategy.criterion.return_value = Music.name.ilike(u'%crime%')
+        table.select().__html__()
+        assert table.count == 1
+        assert strategy.criterion.call_count == 1
+        criteria = table.criteria
+        assert len(criteria.filters) == 1
+        assert len(criteria.orders) == 1
+        assert criteria.elapsed >= 0
+        table.add_filter(IlikeSet(table, request_args))
+        assert table.criteria is not criteria
+        assert len(table.criteria.filters) == 2
+        assert strategy.criterion.call_count == 3
+
+
+@mark.parametrize('counter', [
+    1234,
+    lambda query: 1234,
+])
+@patch('dodotable.schema.Schema.environment', new_callable=PropertyMock,
+       return_value=DodotableTestEnvironment())
+def test_table_counter(environ, fx_session, fx_music, counter):
+    table = Table(cls=Music, label=u'count', columns=[
+        Column(attr='id', label=u'id'),
+    ], sqlalchemy_session=fx_session, counter=counter)
+    with StatementCounter(fx_session, keyword='count(') as counter:
+        soup = extract_soup(table.select())
+        assert counter.count == 0
+    assert table.count == 1234
+    assert table.pager.count == 1234
+    assert soup.find('div', class_='table-information',
+                     text=re.compile('1234'))
+
+
+@patch('dodotable.schema.Schema.environment', new_callable=PropertyMock,
+       return_value=DodotableTestEnvironment())
+def test_table_window_count(environ, fx_session, fx_add_musics):
+    fx_add_musics(15)
+
+    def build():
+        return Table(cls=Music, label=u'window', columns=[
+            Column(attr='id', label=u'id', order_by='id.asc'),
+            Column(attr='name', label=u'이름'),
+        ], sqlalchemy_session=fx_session,
+            count_strategy=Table.COUNT_WINDOW)
+
+    html = Table(cls=Music, label=u'window', columns=[
+        Column(attr='id', label=u'id', order_by='id.asc'),
+        Column(attr='name', label=u'이름'),
+    ], sqlalchemy_session=fx_session).select(10, 10).__html__()
+    with StatementCounter(fx_session, keyword='select') as counter:
+        table = build().select(10, 10)
+        assert table.__html__() == html
+        assert counter.count == 1
+    assert table.count == 15
+    assert [row[0].data for row in table.rows] == list(range(11, 16))
+    # an empty page can't tell the count so it falls back to COUNT(*)
+    with StatementCounter(fx_session, keyword='select') as counter:
+        table = build().select(20, 10)
+        assert table.count == 15
+        assert counter.count == 2
+
+
+@mark.parametrize('build_query', [
+    lambda session: session.query(Artist).join(Artist.musics).distinct(),
+    lambda session: session.query(Artist).join(Artist.musics)
+                           .group_by(Artist.id),
+])
+def test_table_window_count_fallback(fx_session, build_query):
+    for n in range(2):
+        artist = Artist(name=u'artist {}'.format(n))
+        fx_session.add_all([Music(name=u'music {}'.format(i), artist=artist)
+                            for i in range(5)])
+    fx_session.commit()
+    query = build_query(fx_session)
+    assert query.count() == 2
+    table = Table(cls=query, label=u'window', columns=[
+        Column(attr='id', label=u'id'),
+    ], sqlalchemy_session=fx_session, count_strategy=Table.COUNT_WINDOW)
+    with StatementCounter(fx_session, keyword='select') as counter:
+        assert table.select().count == 2
+        assert len(table.rows) == 2
+        assert not any('over' in statement.lower()
+                       for statement in counter.statements)
+
+
+def test_window_countable(fx_session):
+    query = fx_session.query(Artist)
+    assert _window_countable(query)
+    assert _window_countable(query.join(Artist.musics))
+    assert not _window_countable(query.distinct())
+    assert not _window_countable(query.union(fx_session.query(Artist)))
+
+
+def test_table_window_count_unsupported(fx_session, fx_music):
+    table = Table(cls=Music, label=u'window', columns=[
+        Column(attr='id', label=u'id'),
+    ], sqlalchemy_session=fx_session, count_strategy=Table.COUNT_WINDOW)
+    with patch('dodotable.schema.supports_window_functions',
+               return_value=False):
+        with StatementCounter(fx_session, keyword='select') as counter:
+            assert table.select().count == 1
+            assert counter.count == 2
+            assert 'over' not in counter.statements[0].lower()
+
+
+@mark.parametrize('fast', [True, False])
+@patch('dodotable.schema.Schema.environment', new_callable=PropertyMock,
+       return_value=DodotableTestEnvironment())
+def test_table_to_json(environ, fx_session, fx_add_musics, fast):
+    fx_add_musics(15)
+    table = Table(cls=Music, label=u'json', columns=[
+        Column(attr='id', label=u'id', order_by='id.asc'),
+        Column(attr='name', label=u'이름', classes=('name',),
+               _repr=lambda name: name.upper()),
+        LinkedColumn(attr='name', label=u'link',
+                     endpoint=lambda music: '/musics/{}'.format(music.id)),
+    ], sqlalchemy_session=fx_session).select(10, 10)
+    data = table.to_dict()
+    assert data['label'] == u'json'
+    assert data['count'] == 15
+    assert data['columns'][1] == {'label': u'이름', 'attr': 'name',
+                                  'order': None, 'sortable': True,
+                                  'classes': ['name']}
+    assert data['columns'][0]['order'] == 'asc'
+    assert data['rows'] == [
+        [str(n), u'MUSIC {}'.format(n - 1),
+         {'value': u'music {}'.format(n - 1), 'url': '/musics/{}'.format(n)}]
+        for n in range(11, 16)
+    ]
+    assert data['pager']['count'] == 15
+    assert [page['number'] for page in data['pager']['pages']] == [1, 2]
+    assert data['pager']['previous'] == {'number': 1, 'offset': 0,
+                                         'limit': 10, 'selected': False}
+    assert data['pager']['next'] is None
+    assert data['filters'] == []
+    with patch('dodotable.util.orjson',
+               None if not fast else importorskip('orjson')):
+        assert json.loads(table.to_json()) == data
+
+
+class ConcurrentTestEnvironment(DodotableTestEnvironment):
+
+    def __init__(self, bind=None):
+        super(ConcurrentTestEnvironment, self).__init__()
+        self.bind = bind
+
+    def create_session(self):
+        if self.bind is None:
+            return None
+        return Session(bind=self.bind)
+
+
+class ThreadCounter(StatementCounter):
+    """Collect the threads which run ``COUNT(*)`` statements."""
+
+    def __init__(self, bind):
+        super(ThreadCounter, self).__init__(bind)
+        self.threads = []
+
+    def _before_cursor_execute(self, conn, cursor, statement, *args):
+        if 'count(' in statement.lower():
+            self.threads.append(threading.current_thread())
+
+
+@mark.parametrize('create_session', [True, False])
+def test_table_concurrent_count(fx_session, fx_add_musics, create_session):
+    fx_add_musics(15)
+    environment = ConcurrentTestEnvironment(
+        fx_session.get_bind() if create_session else None
+    )
+    with patch('dodotable.schema.Schema.environment',
+               new_callable=PropertyMock, return_value=environment):
+        html = Table(cls=Music, label=u'concurrent', columns=[
+            Column(attr='id', label=u'id', order_by='id.asc'),
+        ], sqlalchemy_session=fx_session).select(10, 10).__html__()
+        table = Table(cls=Music, label=u'concurrent', columns=[
+            Column(attr='id', label=u'id', order_by='id.asc'),
+        ], sqlalchemy_session=fx_session,
+            count_strategy=Table.COUNT_CONCURRENT)
+        with ThreadCounter(fx_session) as counter:
+            table.select(10, 10)
+        assert table.count == 15
+        assert table.__html__() == html
+    assert len(counter.threads) == 1
+    assert (counter.threads[0] is threading.current_thread()) != \
+        create_session
+
+
+@patch('dodotable.schema.Schema.environment', new_callable=PropertyMock,
+       return_value=DodotableTestEnvironment())
+def test_table_seek(environ, fx_session, fx_add_musics):
+    # names repeat so the primary key has to break ties
+    fx_add_musics(25, lambda n: u'music {}'.format(n % 3))
+
+    def seek(cursor=None):
+        table = Table(cls=Music, label=u'seek', columns=[
+            Column(attr='name', label=u'이름', order_by='name.desc'),
+            Column(attr='id', label=u'id'),
+        ], sqlalchemy_session=fx_session)
+        return table.seek(cursor=cursor, limit=10)
+
+    expected = [m.id for m in fx_session.query(Music)
+                                        .order_by(Music.name.desc(),
+                                                  Music.id.asc())]
+    pages = []
+    table = seek()
+    assert table.pager.previous_cursor is None
+    while True:
+        pages.append([row[1].data for row in table.rows])
+        if table.pager.next_cursor is None:
+            break
+        table = seek(table.pager.next_cursor)
+    assert pages == [expected[:10], expected[10:20], expected[20:]]
+
+    table = seek(table.pager.previous_cursor)
+    assert [row[1].data for row in table.rows] == expected[10:20]
+    table = seek(table.pager.previous_cursor)
+    assert [row[1].data for row in table.rows] == expected[:10]
+    assert table.pager.previous_cursor is None
+    assert table.pager.next_cursor
+
+    soup = extract_soup(table)
+    assert soup.find('a', rel='next',
+                     href=re.compile(re.escape(table.pager.next_cursor)))
+    assert not soup.find('a', rel='prev')
+
+
+@mark.parametrize('attr', ['name', 'created_at', 'starts_at', 'id'])
+@mark.parametrize('order', ['asc', 'desc'])
+@patch('dodotable.schema.Schema.environment', new_callable=PropertyMock,
+       return_value=DodotableTestEnvironment())
+def test_table_seek_keys(environ, fx_session, attr, order):
+    for n in range(23):
+        fx_session.add(Event(
+            name=None if n % 3 == 0 else u'event {}'.format(n % 4),
+            created_at=datetime.datetime(2017, 1, 1 + n % 4, 12, tzinfo=UTC),
+            starts_at=None if n % 4 == 0 else datetime.time(n % 5, 30, n),
+        ))
+    fx_session.commit()
+
+    def seek(cursor=None):
+        table = Table(cls=Event, label=u'seek', columns=[
+            Column(attr=attr, label=attr,
+                   order_by='{}.{}'.format(attr, order)),
+            Column(attr='id', label=u'id'),
+        ], sqlalchemy_session=fx_session)
+        return table.seek(cursor=cursor, limit=5)
+
+    # NULL sorts as the greatest value; the primary key breaks ties
+    events = sorted(fx_session.query(Event), key=lambda e: e.id)
+    events.sort(key=lambda e: (getattr(e, attr) is None,
+                               getattr(e, attr) or 0),
+                reverse=order == 'desc')
+    expected = [e.id for e in events]
+    pages = []
+    table = seek()
+    while True:
+        pages.append([row[1].data for row in table.rows])
+        if table.pager.next_cursor is None:
+            break
+        table = seek(table.pager.next_cursor)
+    assert sum(pages, []) == expected
+    assert [len(page) for page in pages] == [5, 5, 5, 5, 3]
+    for page in reversed(pages[:-1]):
+        table = seek(table.pager.previous_cursor)
+        assert [row[1].data for row in table.rows] == page
+
+
+def test_seek_pager_cursor():
+    values = [1, u'이름', datetime.datetime(2017, 1, 2, 3, 4, 5, 6),
+              datetime.datetime(2017, 1, 2), datetime.date(2017, 1, 2),
+              decimal.Decimal('1.5'), None,
+              datetime.datetime(2017, 1, 2, 3, 4, 5, tzinfo=UTC),
+              datetime.time(3, 4, 5, 6), datetime.time(3, 4, tzinfo=UTC),
+              uuid.UUID('12345678123456781234567812345678')]
+    cursor = SeekPager.encode_cursor(SeekPager.NEXT, values)
+    assert SeekPager.decode_cursor(cursor) == (SeekPager.NEXT, values)
+    for cursor in ['', 'garbage', SeekPager.encode_cursor('x', [])]:
+        with raises(BadCursor):
+            SeekPager.decode_cursor(cursor)
+
+
+def _raw_cursor(payload):
+    return base64.urlsafe_b64encode(
+        json.dumps(payload).encode('utf-8')
+    ).decode('ascii')
+
+
+@mark.parametrize('payload', [
+    # a dict unpacks into its two keys
+    {SeekPager.NEXT: 0, SeekPager.PREVIOUS: 0},
+    [SeekPager.NEXT],
+    [SeekPager.NEXT, [1], 2],
+    [SeekPager.NEXT, {'a': 1}],
+    [SeekPager.NEXT, [{'decimal': 'abc'}]],
+    [SeekPager.NEXT, [{'decimal': [1]}]],
+    [SeekPager.NEXT, [{'uuid': 'xyz'}]],
+    [SeekPager.NEXT, [{'date': '2017-13-01'}]],
+    [SeekPager.NEXT, [{'unknown': 'x'}]],
+    [SeekPager.NEXT, [{'date': '2017-01-01', 'uuid': 'x'}]],
+    [SeekPager.NEXT, [[1, 2], 5]],
+])
+def test_seek_pager_crafted_cursor(payload):
+    with raises(BadCursor):
+        SeekPager.decode_cursor(_raw_cursor(payload))
+
+
+@patch('dodotable.schema.Schema.environment', new_callable=PropertyMock,
+       return_value=DodotableTestEnvironment())
+def test_table_seek_crafted_cursor(environ, fx_session, fx_add_musics):
+    fx_add_musics(3)
+    table = Table(cls=Music, label=u'seek', columns=[
+        Column(attr='id', label=u'id'),
+    ], sqlalchemy_session=fx_session)
+    with raises(BadCursor):
+        table.seek(cursor=_raw_cursor([SeekPager.NEXT, [[1, 2]]]),
+                   limit=10)
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+from pytest import mark, skip
+from sqlalchemy.dialects import postgresql, sqlite
+
+from .entities import Music
+from dodotable.condition import Ilike, IlikeSet
+from dodotable.schema import Column, Table
+from dodotable.search import (Contains, Fts5, FullText, Prefix, SearchIndex,
+                              Trigram)
+
+
+def compile(criterion, dialect):
+    return str(criterion.compile(dialect=dialect,
+                                 compile_kwargs={'literal_binds': True}))
+
+
+def test_strategies_sql():
+    pg = postgresql.dialect()
+    assert compile(Contains().criterion(Music.name, u'song'), pg) == \
+        "music.name ILIKE '%%song%%' ESCAPE '\\\\'"
+    assert compile(Prefix().criterion(Music.name, u'Song'), pg) == \
+        "lower(music.name) LIKE 'song%%' ESCAPE '\\\\'"
+    assert compile(Prefix(case_sensitive=True).criterion(Music.name,
+                                                         u'50%_off\\'),
+                   pg) == \
+        "music.name LIKE '50\\\\%%\\\\_off\\\\\\\\%%' ESCAPE '\\\\'"
+    assert compile(FullText().criterion(Music.name, u'song'), pg) == \
+        "to_tsvector('simple', music.name) @@ " \
+        "plainto_tsquery('simple', 'song')"
+    assert compile(Trigram().criterion(Music.name, u'song'), pg) == \
+        "music.name %% 'song'"
+    assert compile(Trigram(word_similarity=True).criterion(Music.name,
+                                                           u'song'),
+                   pg) == "music.name %%> 'song'"
+    assert compile(Fts5('music_fts').criterion(Music.name, u'so"ng'),
+                   sqlite.dialect()) == \
+        "music.id IN (SELECT music_fts.rowid \nFROM music_fts \n" \
+        "WHERE music_fts.name MATCH '\"so\"\"ng\"*')"
+    for strategy in Prefix(), FullText(), Trigram(), Fts5('music_fts'):
+        assert strategy.criterion(Music.name, u'') is None
+
+
+def search(session, strategy, word, index=None):
+    request_args = {'search_music.word': word,
+                    'search_music.type': 'name'}
+    table = Table(cls=Music, label=u'music', columns=[
+        Column(attr='id', label=u'id', order_by='id.asc'),
+        Column(attr='name', label=u'name', filters=[
+            Ilike(Music, 'name', request_args, strategy=strategy),
+        ]),
+    ], sqlalchemy_session=session)
+    table.add_filter(IlikeSet(table, request_args, index=index))
+    return sorted(music.name for music in table.build_base_query())
+
+
+@mark.parametrize('strategy, expected', [
+    (None, [u'Another song', u'Song 50% off', u'songbird']),
+    (Prefix(), [u'Song 50% off', u'songbird']),
+])
+def test_search_strategy(fx_session, strategy, expected):
+    for name in u'Another song', u'Song 50% off', u'songbird', u'lullaby':
+        fx_session.add(Music(name=name))
+    fx_session.commit()
+    assert search(fx_session, strategy, u'song') == expected
+
+
+def test_search_prefix_escape(fx_session):
+    for name in u'Song 50% off', u'Song 500':
+        fx_session.add(Music(name=name))
+    fx_session.commit()
+    assert search(fx_session, Prefix(), u'song 50%') == [u'Song 50% off']
+    assert search(fx_session, Prefix(), u'song 5_') == []
+
+
+def test_search_fts5(fx_session):
+    if fx_session.get_bind().dialect.name != 'sqlite':
+        skip('FTS5 is only for SQLite')
+    for name in u'Another song', u'Songbird', u'lullaby':
+        fx_session.add(Music(name=name))
+    fx_session.commit()
+    fx_session.execute("CREATE VIRTUAL TABLE music_fts USING fts5"
+                       "(name, content='music', content_rowid='id')")
+    try:
+        fx_session.execute("INSERT INTO music_fts(music_fts) "
+                           "VALUES('rebuild')")
+        assert search(fx_session, Fts5('music_fts'), u'song') == \
+            [u'Another song', u'Songbird']
+    finally:
+        fx_session.rollback()
+        fx_session.execute('DROP TABLE IF EXISTS music_fts')
+        fx_session.commit()
+
+
+def test_search_index(fx_session):
+    names = [u'Another song', u'Song 50% off', u'songbird', u'lullaby']
+    for name in names:
+        fx_session.add(Music(name=name))
+    fx_session.commit()
+    index = SearchIndex(Music, ['name']).build(fx_session)
+    # % and _ are not wildcards on either side
+    for word in u'song', u'SONG', u'so', u'50% o', u'll', u'songs', u'', \
+            u'%', u'5_', u'g_5':
+        assert search(fx_session, None, word, index=index) == \
+            search(fx_session, None, word)
+    assert str(index.criterion(Music.name, u'zzz')) == 'false'
+    index.listen(fx_session)
+    try:
+        lullaby = fx_session.query(Music).filter_by(name=u'lullaby').one()
+        lullaby.name = u'lullaby song'
+        fx_session.add(Music(name=u'new song'))
+        fx_session.flush()
+        assert search(fx_session, None, u'song', index=index) == \
+            [u'Another song', u'Song 50% off', u'songbird']
+        fx_session.commit()
+        assert search(fx_session, None, u'song', index=index) == \
+            [u'Another song', u'Song 50% off', u'lullaby song',
+             u'new song', u'songbird']
+        fx_session.delete(lullaby)
+        fx_session.add(Music(name=u'rolled back song'))
+        fx_session.flush()
+        fx_session.rollback()
+        assert len(index.search('name', u'song')) == 5
+        fx_session.delete(lullaby)
+        fx_session.commit()
+        assert search(fx_session, None, u'song', index=index) == \
+            [u'Another song', u'Song 50% off', u'new song', u'songbird']
+    finally:
+        index.close()
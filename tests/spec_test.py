@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+from mock import PropertyMock, patch
+
+from .entities import Music
+from .helper import DodotableTestEnvironment
+from dodotable.condition import Ilike, IlikeSet, SelectFilter
+from dodotable.helper import Limit
+from dodotable.schema import Column
+from dodotable.spec import TableSpec
+
+
+CHOICES = [{'name': u'song 1', 'description': u'song 1'},
+           {'name': u'song 2', 'description': u'song 2'}]
+
+
+def name_column(request_args, order_by):
+    return Column(attr='name', label=u'name', order_by=order_by, filters=[
+        Ilike(Music, 'name', request_args),
+    ])
+
+
+def columns(request_args, order_by='id.desc'):
+    return [
+        Column(attr='id', label=u'id', order_by=order_by),
+        name_column(request_args, order_by),
+    ]
+
+
+@patch('dodotable.schema.Schema.environment', new_callable=PropertyMock,
+       return_value=DodotableTestEnvironment())
+def test_table_spec(environ, fx_session, fx_musics, fx_music_table):
+    spec = TableSpec(Music, u'music', columns=columns(None))
+    spec.add_filter(IlikeSet(spec, None))
+    spec.add_filter(SelectFilter(Music, 'name', CHOICES, None))
+    spec.add_filter(Limit(spec, None))
+    for request_args in [
+        {},
+        {'select.name': u'song 1'},
+        {'search_music.word': u'2', 'search_music.type': 'name',
+         'order_by': 'name.asc'},
+    ]:
+        table = spec.bind(request_args, fx_session).select(0, 5)
+        order_by = request_args.get('order_by', 'id.desc')
+        expected = fx_music_table([name_column(request_args, order_by)],
+                                  order_by=order_by)
+        expected.add_filter(IlikeSet(expected, request_args))
+        expected.add_filter(SelectFilter(Music, 'name', CHOICES,
+                                         request_args))
+        expected.add_filter(Limit(expected, request_args))
+        expected = expected.select(0, 5)
+        assert table.__html__() == expected.__html__()
+        assert table.to_dict() == expected.to_dict()
+    assert [column.order_by for column in spec._columns] == ['desc', None]
+    assert spec._columns[1].filters[0].request_args is None
+    assert all(filter.request_args is None for filter in spec._filters)
+    assert spec._filters[0].table is spec
+
+
+def test_table_spec_options():
+    spec = TableSpec(Music, u'music', columns=columns(None), flat=True,
+                     counter=10)
+    table = spec.bind({'order_by': 'unknown.asc'}, object())
+    assert table.flat
+    assert table.count == 10
+    assert [column.order_by for column in table.columns] == ['desc', None]
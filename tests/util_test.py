@@ -1,6 +1,12 @@
+import gettext
+
+from jinja2 import DictLoader
 from six import text_type
 
-from dodotable.util import string_literal, _get_data
+from dodotable.environment import Environment
+from dodotable.util import (EnvironmentCache, data_getter, get_template,
+                            invalidate_environments, render, string_literal,
+                            supports_window_functions, _get_data)
 
 
 def test__get_data():
@@ -23,3 +29,114 @@ def test_string_literal():
     assert isinstance(string_literal(1.1), text_type)
     assert isinstance(string_literal('hello'), text_type)
     assert isinstance(string_literal(u'hello'), text_type)
+
+
+def test_environment_cache():
+    cache = EnvironmentCache(maxsize=2)
+    loader = DictLoader({'a.html': '{{ a }}'})
+    env = cache.get(loader, 'ko')
+    assert cache.get(loader, 'ko') is env
+    assert cache.get(loader, 'ja') is not env
+    assert len(cache) == 2
+    cache.get(loader, None)
+    assert len(cache) == 2
+    # the least recently used one, 'ko', was evicted
+    assert cache.get(loader, 'ko') is not env
+
+
+def test_environment_cache_invalidate():
+    cache = EnvironmentCache()
+    loader = DictLoader({'a.html': '{{ a }}'})
+    other_loader = DictLoader({'a.html': '{{ a }}'})
+    env = cache.get(loader)
+    other_env = cache.get(other_loader)
+    cache.invalidate(loader)
+    assert cache.get(loader) is not env
+    assert cache.get(other_loader) is other_env
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+def test_render_uses_cached_template():
+    loader = DictLoader({'a.html': '{{ a }} {{ b }}'})
+    extra_environments = {'template_loader': loader, 'b': 'world'}
+    try:
+        assert render('a.html', extra_environments, a='hello') == \
+            'hello world'
+        template = get_template('a.html', extra_environments)
+        assert get_template('a.html', extra_environments) is template
+        loader.mapping['a.html'] = '{{ b }}'
+        # templates are not reloaded until the environment is invalidated
+        assert render('a.html', extra_environments, a='hello') == \
+            'hello world'
+        invalidate_environments(loader)
+        assert render('a.html', extra_environments) == 'world'
+    finally:
+        invalidate_environments(loader)
+
+
+class TranslatedEnvironment(Environment):
+
+    template_loader = DictLoader({
+        'trans.html': '{% trans %}Next{% endtrans %}',
+    })
+
+    def get_translations(self):
+        locale = self.get_locale and self.get_locale()
+        if locale is None:
+            return None
+        translations = gettext.NullTranslations()
+        translations.gettext = translations.ugettext = \
+            lambda message: u'{}:{}'.format(locale, message)
+        return translations
+
+
+def test_render_translations_per_locale():
+    locale = ['ko']
+    environment = TranslatedEnvironment(lambda: locale[0])
+    try:
+        assert render('trans.html', environment.__dict__()) == u'ko:Next'
+        locale[0] = 'ja'
+        assert render('trans.html', environment.__dict__()) == u'ja:Next'
+        locale[0] = None
+        assert render('trans.html', environment.__dict__()) == u'Next'
+    finally:
+        invalidate_environments(environment.template_loader)
+
+
+def test_supports_window_functions():
+    def dialect(name, version=None, **kwargs):
+        return type('dialect', (), dict(name=name,
+                                        server_version_info=version,
+                                        **kwargs))()
+
+    sqlite = type('dbapi', (), {'sqlite_version_info': (3, 24, 0)})
+    assert not supports_window_functions(dialect('sqlite', dbapi=sqlite))
+    sqlite.sqlite_version_info = (3, 25, 0)
+    assert supports_window_functions(dialect('sqlite', dbapi=sqlite))
+    assert supports_window_functions(dialect('postgresql'))
+    assert not supports_window_functions(dialect('mysql'))
+    assert not supports_window_functions(dialect('mysql', (5, 7, 21)))
+    assert supports_window_functions(dialect('mysql', (8, 0, 3)))
+    assert supports_window_functions(dialect('mysql', (10, 2, 0),
+                                             is_mariadb=True))
+    assert not supports_window_functions(dialect('firebird', (3, 0)))
+
+
+def test_data_getter():
+    class Data(object):
+
+        @property
+        def broken(self):
+            raise AttributeError('broken')
+
+    data = Data()
+    data.a = type('custom', (), {'c': 'ac', 'n': None})
+    get_ac = data_getter('a.c')
+    assert data_getter('a.c') is get_ac
+    assert get_ac(data) == 'ac'
+    assert get_ac(None) is None
+    assert get_ac(None, 'default') == 'default'
+    assert data_getter('a.n.x')(data, 'default') == 'default'
+    assert data_getter('broken')(data, 'default') == 'default'
+    assert data_getter('broken.x')(data, 'default') == 'default'